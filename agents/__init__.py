@@ -4,16 +4,26 @@ ResearchPro Agents Module
 Contains all specialized agents for the research system.
 """
 
-from agents.orchestrator import create_orchestrator_agent
+from agents.client import get_shared_client
+from agents.orchestrator import create_app, create_orchestrator_agent, create_research_team
 from agents.search_agent import create_search_agent
 from agents.summarizer import create_summarizer_agent
 from agents.fact_checker import create_fact_checker_agent
 from agents.report_generator import create_report_generator_agent
+from agents.rate_limit import GeminiRateLimiter, gemini_limiter
+from agents.response_cache import ResponseCache, response_cache
 
 __all__ = [
+    'get_shared_client',
+    'create_app',
     'create_orchestrator_agent',
+    'create_research_team',
     'create_search_agent',
     'create_summarizer_agent',
     'create_fact_checker_agent',
     'create_report_generator_agent',
+    'GeminiRateLimiter',
+    'gemini_limiter',
+    'ResponseCache',
+    'response_cache',
 ]
@@ -0,0 +1,54 @@
+"""
+Agent Builder - Shared construction logic for all ResearchPro agents.
+"""
+
+from typing import Any, List, Optional
+
+from google import genai
+from google.genai import types
+from google.adk import Agent
+from google.adk.models import Gemini
+
+from agents.response_cache import cache_callbacks
+
+
+def build_agent(
+    name: str,
+    client: genai.Client,
+    model: str,
+    prompt: str,
+    config: types.GenerateContentConfig,
+    tools: Optional[List[Any]] = None,
+    sub_agents: Optional[List[Agent]] = None
+) -> Agent:
+    """
+    Build an agent from its static prompt and generation config.
+    
+    Configs are module-level constants shared by every agent built from
+    them; ADK copies them per request, so they are never mutated. The
+    model is bound to `client`, so every agent sends its requests through
+    the shared connection pool instead of a client of its own; that pool
+    belongs to the event loop that first uses it, which is the single
+    loop main() runs on.
+    
+    Args:
+        name: Agent name
+        client: Shared Gemini client the model sends requests through
+        model: Gemini model name
+        prompt: Static system prompt
+        config: Generation config for the agent
+        tools: Tools available to the agent
+        sub_agents: Agents this agent can delegate to
+        
+    Returns:
+        Configured agent
+    """
+    return Agent(
+        name=name,
+        model=Gemini(model=model, client=client),
+        static_instruction=prompt,  # Sent verbatim so it can be cached
+        tools=list(tools or []),
+        sub_agents=list(sub_agents or []),
+        generate_content_config=config,
+        **cache_callbacks(config.temperature)
+    )
@@ -0,0 +1,36 @@
+"""
+Gemini Client - Shared client and connection pool for all agents.
+"""
+from functools import lru_cache
+
+import httpx
+from google import genai
+from google.genai import types
+
+
+@lru_cache(maxsize=None)
+def get_shared_client(api_key: str) -> genai.Client:
+    """
+    Return the process-wide Gemini client for an API key.
+    
+    Every ResearchProSystem (and every agent factory it feeds) reuses the
+    same client, so concurrent requests share one keep-alive connection
+    pool instead of paying a TLS handshake per client.
+    
+    Args:
+        api_key: Gemini API key
+        
+    Returns:
+        Shared Gemini client
+    """
+    return genai.Client(
+        api_key=api_key,
+        http_options=types.HttpOptions(
+            async_client_args={
+                "limits": httpx.Limits(
+                    max_connections=64,
+                    max_keepalive_connections=32
+                )
+            }
+        )
+    )
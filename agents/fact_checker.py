@@ -3,8 +3,11 @@ Fact Checker Agent - Specialized agent for validating information accuracy.
 """
 from typing import Dict, Any, List
 from google import genai
+from google.genai import types
 from google.adk import Agent
 
+from agents.base import build_agent
+
 FACT_CHECKER_PROMPT = """
 You are a Fact Checker Agent specialized in validating information accuracy.
 
@@ -25,12 +28,11 @@ Evaluation criteria:
 Output a confidence score (0-1) for each verified claim.
 """
 
+FACT_CHECKER_CONFIG = types.GenerateContentConfig(temperature=0.2, top_p=0.7, max_output_tokens=1024)
+
 def create_fact_checker_agent(client: genai.Client, tools: List[Any]) -> Agent:
     """Create fact checker agent."""
-    return Agent(
-        name="fact_checker_agent",
-        model="gemini-2.0-flash-exp",
-        instruction=FACT_CHECKER_PROMPT,
-        tools=tools,
-        generate_content_config={"temperature": 0.2, "top_p": 0.7, "max_output_tokens": 1024}
+    return build_agent(
+        "fact_checker_agent", client, "gemini-2.0-flash-exp", FACT_CHECKER_PROMPT, FACT_CHECKER_CONFIG,
+        tools=tools
     )
@@ -8,9 +8,31 @@ This agent coordinates the multi-agent research workflow:
 - Handles error recovery and retry logic
 """
 
-from typing import Dict, Any, List, Optional
+import asyncio
+import json
+from functools import lru_cache
+from typing import (
+    Dict, Any, List, Optional, AsyncIterator, Awaitable, Callable, Iterable, Tuple, TypeVar
+)
 from google import genai
+from google.genai import types
 from google.adk import Agent
+from google.adk.agents import RunConfig
+from google.adk.agents.context_cache_config import ContextCacheConfig
+from google.adk.agents.run_config import StreamingMode
+from google.adk.apps import App
+from google.adk.runners import InMemoryRunner
+
+from agents.base import build_agent
+from agents.fact_checker import create_fact_checker_agent
+from agents.rate_limit import gemini_limiter
+from agents.report_generator import create_report_generator_agent
+from agents.search_agent import create_search_agent
+from agents.summarizer import create_summarizer_agent
+
+T = TypeVar("T")
+AgentRunner = Callable[[Agent, str], Awaitable[str]]
+AgentStreamer = Callable[[Agent, str], AsyncIterator[str]]
 
 
 ORCHESTRATOR_PROMPT = """
@@ -53,6 +75,13 @@ You have access to specialized sub-agents as tools. Use them strategically to pr
 high-quality research outputs efficiently.
 """
 
+ORCHESTRATOR_CONFIG = types.GenerateContentConfig(
+    temperature=0.3,  # Lower for more focused coordination
+    top_p=0.8,
+    top_k=40,
+    max_output_tokens=2048,
+)
+
 
 def create_orchestrator_agent(
     client: genai.Client,
@@ -79,62 +108,275 @@ def create_orchestrator_agent(
     # Create orchestrator with sub-agents
     # Note: Custom tools like quality_scorer need to be wrapped as BaseTool instances
     # For now, only using sub-agents without additional tools
-    orchestrator = Agent(
-        name="orchestrator_agent",
-        model="gemini-2.0-flash-exp",  # Use latest Gemini model
-        instruction=ORCHESTRATOR_PROMPT,
+    return build_agent(
+        "orchestrator_agent",
+        client,
+        "gemini-2.0-flash-exp",  # Use latest Gemini model
+        ORCHESTRATOR_PROMPT,
+        ORCHESTRATOR_CONFIG,
         sub_agents=[
             search_agent,
             summarizer_agent,
             fact_checker_agent,
             report_generator_agent
-        ],
-        generate_content_config={
-            "temperature": 0.3,  # Lower for more focused coordination
-            "top_p": 0.8,
-            "top_k": 40,
-            "max_output_tokens": 2048,
-        }
+        ]
     )
+
+
+def create_research_team(
+    client: genai.Client,
+    search_tools: Iterable[Any],
+    fact_check_tools: Iterable[Any]
+) -> Agent:
+    """
+    Create (or reuse) the orchestrator together with its sub-agents.
     
-    return orchestrator
+    The whole agent tree is memoized on the client and tool objects, so
+    callers that rebuild the system with the same inputs (e.g. one system
+    per test case) get the existing tree back. Caching happens at the tree
+    level because an ADK agent can only belong to one parent.
+    
+    Args:
+        client: Gemini client
+        search_tools: Tools for the search agent
+        fact_check_tools: Tools for the fact checker agent
+        
+    Returns:
+        Orchestrator agent; sub-agents are reachable via find_sub_agent
+    """
+    return _create_research_team(client, tuple(search_tools), tuple(fact_check_tools))
+
+
+@lru_cache(maxsize=32)
+def _create_research_team(
+    client: genai.Client,
+    search_tools: Tuple[Any, ...],
+    fact_check_tools: Tuple[Any, ...]
+) -> Agent:
+    return create_orchestrator_agent(
+        client=client,
+        search_agent=create_search_agent(client=client, tools=list(search_tools)),
+        summarizer_agent=create_summarizer_agent(client=client, tools=[]),
+        fact_checker_agent=create_fact_checker_agent(client=client, tools=list(fact_check_tools)),
+        report_generator_agent=create_report_generator_agent(client=client, tools=[]),
+        quality_scorer=None  # Not wired into the orchestrator yet
+    )
+
+
+# Streams partial model output as it is generated instead of one final event
+STREAMING_RUN_CONFIG = RunConfig(streaming_mode=StreamingMode.SSE)
+
+
+# Agent prompts are static instructions, so once a multi-turn session's prompt
+# prefix is large enough Gemini serves it from the context cache. ADK only
+# creates the cache after a session's earlier requests, so this applies to the
+# deployed app, not to the one-shot sessions run_agent and stream_agent open.
+CONTEXT_CACHE_CONFIG = ContextCacheConfig(
+    min_tokens=2048,
+    ttl_seconds=3600,
+    cache_intervals=10
+)
+
+
+def create_app(agent: Agent) -> App:
+    """ADK app running an agent with context caching enabled."""
+    return App(
+        name="researchpro",
+        root_agent=agent,
+        context_cache_config=CONTEXT_CACHE_CONFIG
+    )
+
+
+async def _open_session(agent: Agent, user_id: str) -> Tuple[InMemoryRunner, str]:
+    """Create a runner for an agent plus a throwaway session to run it in."""
+    runner = InMemoryRunner(agent=agent, app_name="researchpro")
+    session = await runner.session_service.create_session(
+        app_name="researchpro",
+        user_id=user_id
+    )
+    return runner, session.id
+
+
+async def run_agent(agent: Agent, prompt: str, user_id: str = "orchestrator") -> str:
+    """
+    Run a single agent turn and return its final text response.
+    
+    Args:
+        agent: Agent to run
+        prompt: User message sent to the agent
+        user_id: User identifier for the throwaway session
+        
+    Returns:
+        Text of the agent's final response
+    """
+    runner, session_id = await _open_session(agent, user_id)
+    message = types.Content(role="user", parts=[types.Part(text=prompt)])
+    
+    response = ""
+    async with gemini_limiter.slot():
+        async for event in runner.run_async(
+            user_id=user_id,
+            session_id=session_id,
+            new_message=message
+        ):
+            if event.is_final_response() and event.content and event.content.parts:
+                response = "".join(part.text or "" for part in event.content.parts)
+    
+    return response
+
+
+async def stream_agent(
+    agent: Agent,
+    prompt: str,
+    user_id: str = "orchestrator"
+) -> AsyncIterator[str]:
+    """
+    Run a single agent turn, yielding response text as chunks arrive.
+    
+    Lets callers display or forward long outputs (e.g. a 4096-token report)
+    while the model is still generating.
+    """
+    runner, session_id = await _open_session(agent, user_id)
+    message = types.Content(role="user", parts=[types.Part(text=prompt)])
+    
+    streamed = False
+    async with gemini_limiter.slot():
+        async for event in runner.run_async(
+            user_id=user_id,
+            session_id=session_id,
+            new_message=message,
+            run_config=STREAMING_RUN_CONFIG
+        ):
+            if not (event.content and event.content.parts):
+                continue
+            if event.partial:
+                streamed = True
+                for part in event.content.parts:
+                    if part.text:
+                        yield part.text
+            elif event.is_final_response() and not streamed:
+                # Model answered without streaming; emit the whole response once
+                yield "".join(part.text or "" for part in event.content.parts)
+
+
+async def gather_bounded(aws: Iterable[Awaitable[T]], limit: int) -> List[T]:
+    """
+    Await all awaitables concurrently with at most `limit` in flight.
+    
+    Keeps parallel sub-agent fan-out within Gemini QPS quotas.
+    """
+    semaphore = asyncio.Semaphore(limit)
+    
+    async def _bounded(aw: Awaitable[T]) -> T:
+        async with semaphore:
+            return await aw
+    
+    return await asyncio.gather(*(_bounded(aw) for aw in aws))
+
+
+def research_brief(query: str, context: Dict[str, Any]) -> str:
+    """
+    Canonical prompt prefix describing a research request.
+    
+    Rendered deterministically (sorted keys) so every step of one request
+    sends byte-identical leading text, letting Gemini reuse the cached
+    prefix instead of re-processing it on each call.
+    """
+    return (
+        f"Research Query: {query}\n\n"
+        f"Context: {json.dumps(context, sort_keys=True, default=str)}"
+    )
 
 
 # Example usage showing how orchestrator coordinates agents
 async def orchestrate_research_example(
     orchestrator: Agent,
     query: str,
-    context: Dict[str, Any]
+    context: Dict[str, Any],
+    subqueries: Optional[List[str]] = None,
+    max_concurrency: int = 3,
+    run: AgentRunner = run_agent,
+    stream: AgentStreamer = stream_agent,
+    on_report_chunk: Optional[Callable[[str], Any]] = None
 ) -> Dict[str, Any]:
     """
     Example of how the orchestrator coordinates the research workflow.
     
+    Sub-agents run as a pipeline:
+    1. Searches for every subquery (parallel, bounded by max_concurrency)
+    2. Fact checking of each finding as soon as its search completes
+    3. Summarization of all findings (parallel with remaining fact checks)
+    4. Report generation from the summary and fact checks (sequential),
+       streamed: each chunk is passed to `on_report_chunk` as it arrives
+    
     This demonstrates:
     - Breaking down complex tasks
-    - Sequential agent execution
-    - Quality-based iteration
+    - Parallel and sequential agent execution
     - Result aggregation
     """
-    # Orchestrator analyzes query and plans execution
-    plan_prompt = f"""
-    Research Query: {query}
+    search_agent = orchestrator.find_sub_agent("search_agent")
+    fact_checker_agent = orchestrator.find_sub_agent("fact_checker_agent")
+    summarizer_agent = orchestrator.find_sub_agent("summarizer_agent")
+    report_generator_agent = orchestrator.find_sub_agent("report_generator_agent")
     
-    Context: {context}
+    subqueries = subqueries or [query]
+    # Downstream prompts all start with the same brief and append only their
+    # own task, so repeated calls share a prompt prefix Gemini can cache
+    brief = research_brief(query, context)
+    findings_queue: asyncio.Queue = asyncio.Queue(maxsize=8)
     
-    Create a detailed execution plan for this research request:
-    1. What specific searches should be performed (can be parallel)?
-    2. What validation steps are needed?
-    3. What quality standards apply?
-    4. What format should the final report use?
+    async def search(subquery: str):
+        await findings_queue.put(await run(search_agent, subquery))
     
-    Provide your plan in structured format.
-    """
+    async def produce_findings():
+        # Independent searches run concurrently; each finding is queued as it lands
+        try:
+            await gather_bounded((search(q) for q in subqueries), max_concurrency)
+        finally:
+            await findings_queue.put(None)
+    
+    # Fact checking starts on each finding while other searches are in flight
+    producer = asyncio.create_task(produce_findings())
+    search_results = []
+    fact_checks = []
+    try:
+        while (finding := await findings_queue.get()) is not None:
+            search_results.append(finding)
+            fact_checks.append(asyncio.create_task(
+                run(fact_checker_agent, f"{brief}\n\nVerify the claims in this finding:\n\n{finding}")
+            ))
+        await producer
+    except BaseException:
+        for task in fact_checks:
+            task.cancel()
+        raise
+    finally:
+        producer.cancel()
+    
+    findings = "\n\n".join(search_results)
+    summary, *fact_check_results = await asyncio.gather(
+        run(summarizer_agent, f"{brief}\n\nSummarize these findings:\n\n{findings}"),
+        *fact_checks
+    )
+    fact_check = "\n\n".join(fact_check_results)
     
-    # Orchestrator would execute this plan using its tools (sub-agents)
-    # In production, this would be handled by the ADK's agent execution engine
+    # The report is the longest output; stream it so callers can show it
+    # while the model is still generating
+    report_chunks = []
+    async for chunk in stream(
+        report_generator_agent,
+        f"{brief}\n\nSummary:\n{summary}\n\nFact check:\n{fact_check}"
+    ):
+        report_chunks.append(chunk)
+        if on_report_chunk is not None:
+            on_report_chunk(chunk)
+    report = "".join(report_chunks)
     
     return {
-        "status": "planned",
-        "execution_plan": "Multi-step research plan",
-        "estimated_duration": "2-3 minutes"
+        "status": "completed",
+        "subqueries": subqueries,
+        "search_results": search_results,
+        "fact_check": fact_check,
+        "summary": summary,
+        "report": report
     }
@@ -0,0 +1,69 @@
+"""
+Rate Limiting - Shared limits on Gemini calls across all agents.
+
+Orchestrator fan-out can easily exceed the Gemini requests-per-minute
+quota; pacing calls here avoids 429 retries and their backoff delays.
+"""
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+
+class GeminiRateLimiter:
+    """
+    Bounds in-flight Gemini calls and paces them to a per-minute budget.
+    
+    Combines a semaphore (max concurrent calls) with a token bucket
+    (max calls per minute, bursting up to the full minute's budget).
+    """
+    
+    def __init__(self, max_concurrency: int = 8, max_rpm: int = 60):
+        self.max_concurrency = max_concurrency
+        self.max_rpm = max_rpm
+        self._rate = max_rpm / 60.0  # Tokens per second
+        self._tokens = float(max_rpm)
+        self._updated = time.monotonic()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock: Optional[asyncio.Lock] = None
+    
+    def _bind_loop(self):
+        """Create the asyncio primitives for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._lock = asyncio.Lock()
+    
+    async def _take_token(self):
+        """Wait until the bucket holds a token, then consume it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    float(self.max_rpm),
+                    self._tokens + (now - self._updated) * self._rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+    
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one Gemini call slot for the duration of the block."""
+        self._bind_loop()
+        async with self._semaphore:
+            await self._take_token()
+            yield
+
+
+# Shared by every agent in the process
+gemini_limiter = GeminiRateLimiter(
+    max_concurrency=int(os.getenv("GEMINI_MAX_CONCURRENCY", "8")),
+    max_rpm=int(os.getenv("GEMINI_MAX_RPM", "60"))
+)
@@ -3,8 +3,11 @@ Report Generator Agent - Specialized agent for creating professional research re
 """
 from typing import Dict, Any, List
 from google import genai
+from google.genai import types
 from google.adk import Agent
 
+from agents.base import build_agent
+
 REPORT_GENERATOR_PROMPT = """
 You are a Report Generator Agent specialized in creating professional research reports.
 
@@ -24,12 +27,11 @@ Report structure:
 6. Sources (properly formatted citations)
 """
 
+REPORT_GENERATOR_CONFIG = types.GenerateContentConfig(temperature=0.5, top_p=0.9, max_output_tokens=4096)
+
 def create_report_generator_agent(client: genai.Client, tools: List[Any]) -> Agent:
     """Create report generator agent."""
-    return Agent(
-        name="report_generator_agent",
-        model="gemini-1.5-pro",
-        instruction=REPORT_GENERATOR_PROMPT,
-        tools=tools,
-        generate_content_config={"temperature": 0.5, "top_p": 0.9, "max_output_tokens": 4096}
+    return build_agent(
+        "report_generator_agent", client, "gemini-1.5-pro", REPORT_GENERATOR_PROMPT, REPORT_GENERATOR_CONFIG,
+        tools=tools
     )
@@ -0,0 +1,177 @@
+"""
+Response Cache - Reuse model responses across repeated sub-agent requests.
+
+Attached to agents through ADK model callbacks:
+- before_model_callback returns a cached response and skips the Gemini call
+- after_model_callback stores fresh responses for later reuse
+- on_model_error_callback drops the bookkeeping of failed calls
+"""
+
+import hashlib
+import re
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+
+
+# Only low-temperature agents give answers stable enough to replay
+MAX_CACHEABLE_TEMPERATURE = 0.3
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+_WHITESPACE_RE = re.compile(r"\s+")
+# Function call IDs are generated per call and would defeat every lookup
+_PER_CALL_FIELDS = {"function_call": {"id"}, "function_response": {"id"}}
+
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    Normalize a prompt so trivially different phrasings share a cache key.
+
+    Lowercases, strips punctuation and collapses whitespace.
+    """
+    prompt = _PUNCTUATION_RE.sub("", prompt.lower())
+    return _WHITESPACE_RE.sub(" ", prompt).strip()
+
+
+def _part_key(part: types.Part) -> str:
+    """Cache-key fragment for one content part."""
+    if part.text is not None:
+        return normalize_prompt(part.text)
+    return part.model_dump_json(exclude_none=True, exclude=_PER_CALL_FIELDS)
+
+
+def _has_function_call(llm_response: LlmResponse) -> bool:
+    return any(part.function_call for part in llm_response.content.parts or [])
+
+
+class ResponseCache:
+    """
+    In-process cache of LLM responses keyed on the normalized request.
+
+    Keys combine agent name, model, normalized prompt and a hash of the
+    tools offered to the model, so the same question asked of a different
+    agent or tool set never collides.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = 1024
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[float, LlmResponse]] = {}
+        # (invocation_id, agent_name) -> key of the request awaiting a response
+        self._pending: Dict[Tuple[str, str], str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, agent_name: str, llm_request: LlmRequest) -> str:
+        """
+        Build the cache key for a model request.
+
+        Every part of the conversation counts: text parts are normalized,
+        while function calls and responses are serialized whole (minus their
+        per-call IDs), so a request made after a tool round trip never shares
+        a key with the request that triggered the tool.
+        """
+        prompt = "\n".join(
+            f"{content.role}:{_part_key(part)}"
+            for content in llm_request.contents or []
+            for part in content.parts or []
+        )
+        tools = ",".join(sorted(llm_request.tools_dict))
+        tools_hash = hashlib.md5(tools.encode()).hexdigest()
+        raw = f"{agent_name}:{llm_request.model}:{prompt}:{tools_hash}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def before_model(
+        self,
+        callback_context: CallbackContext,
+        llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        """Return a cached response, or remember the key for after_model."""
+        key = self.make_key(callback_context.agent_name, llm_request)
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            expires_at, response = entry
+            if expires_at > time.monotonic():
+                self.hits += 1
+                return response.model_copy(deep=True)
+            del self._entries[key]
+
+        self.misses += 1
+        self._pending[(callback_context.invocation_id, callback_context.agent_name)] = key
+        return None
+
+    def after_model(
+        self,
+        callback_context: CallbackContext,
+        llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        """Store a completed response under the key seen in before_model."""
+        # Streaming calls this once per partial chunk; wait for the final one
+        if llm_response.partial:
+            return None
+        key = self._pending.pop(
+            (callback_context.invocation_id, callback_context.agent_name),
+            None
+        )
+        if key is None or llm_response.error_code or not llm_response.content:
+            return None
+        # Replaying a function call would re-run the tool on every turn
+        if _has_function_call(llm_response):
+            return None
+
+        if len(self._entries) >= self.max_entries:
+            # Evict the oldest entry (dicts keep insertion order)
+            self._entries.pop(next(iter(self._entries)))
+
+        self._entries[key] = (
+            time.monotonic() + self.ttl_seconds,
+            llm_response.model_copy(deep=True)
+        )
+        return None
+
+    def on_model_error(
+        self,
+        callback_context: CallbackContext,
+        llm_request: LlmRequest,
+        error: Exception
+    ) -> Optional[LlmResponse]:
+        """Forget the pending key of a failed model call; the error propagates."""
+        self._pending.pop(
+            (callback_context.invocation_id, callback_context.agent_name),
+            None
+        )
+        return None
+
+    def clear(self):
+        """Drop all cached responses."""
+        self._entries.clear()
+        self._pending.clear()
+
+
+# Shared by all agents so identical sub-calls hit across agent instances
+response_cache = ResponseCache()
+
+
+def cache_callbacks(temperature: float) -> Dict[str, Any]:
+    """
+    Agent keyword arguments that attach the shared response cache.
+
+    Returns an empty dict for agents sampling above MAX_CACHEABLE_TEMPERATURE,
+    whose outputs are meant to vary between calls.
+    """
+    if temperature > MAX_CACHEABLE_TEMPERATURE:
+        return {}
+    return {
+        "before_model_callback": response_cache.before_model,
+        "after_model_callback": response_cache.after_model,
+        "on_model_error_callback": response_cache.on_model_error,
+    }
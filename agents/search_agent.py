@@ -9,9 +9,14 @@ This agent performs intelligent searches across multiple sources:
 """
 
 from typing import List, Dict, Any
+
+import numpy as np
 from google import genai
+from google.genai import types
 from google.adk import Agent
 
+from agents.base import build_agent
+
 
 SEARCH_AGENT_PROMPT = """
 You are a Search Agent specialized in finding high-quality information sources.
@@ -45,6 +50,13 @@ For each source you find, provide:
 Focus on quality over quantity. Better to have 5 excellent sources than 20 mediocre ones.
 """
 
+SEARCH_AGENT_CONFIG = types.GenerateContentConfig(
+    temperature=0.4,  # Moderate creativity for query reformulation
+    top_p=0.9,
+    top_k=40,
+    max_output_tokens=1024,
+)
+
 
 def create_search_agent(
     client: genai.Client,
@@ -60,23 +72,22 @@ def create_search_agent(
     Returns:
         Configured search agent
     """
-    search_agent = Agent(
-        name="search_agent",
-        model="gemini-2.0-flash-exp",
-        instruction=SEARCH_AGENT_PROMPT,
-        tools=tools,
-        generate_content_config={
-            "temperature": 0.4,  # Moderate creativity for query reformulation
-            "top_p": 0.9,
-            "top_k": 40,
-            "max_output_tokens": 1024,
-        }
+    return build_agent(
+        "search_agent", client, "gemini-2.0-flash-exp", SEARCH_AGENT_PROMPT, SEARCH_AGENT_CONFIG,
+        tools=tools
     )
-    
-    return search_agent
 
 
 # Utility functions for search optimization
+_QUALITY_FACTORS = ("credibility", "relevance", "recency", "depth")
+
+# Terms appended per search type; unknown types leave the query untouched
+_QUERY_SUFFIXES = {
+    "academic": " research study peer-reviewed",  # Academic-focused terms
+    "news": " latest recent 2024",  # Recency indicators
+}
+
+
 def optimize_search_query(query: str, search_type: str = "general") -> str:
     """
     Optimize search query based on type.
@@ -88,14 +99,8 @@ def optimize_search_query(query: str, search_type: str = "general") -> str:
     Returns:
         Optimized query string
     """
-    if search_type == "academic":
-        # Add academic-focused terms
-        return f"{query} research study peer-reviewed"
-    elif search_type == "news":
-        # Add recency indicators
-        return f"{query} latest recent 2024"
-    else:
-        return query
+    suffix = _QUERY_SUFFIXES.get(search_type)
+    return query + suffix if suffix else query
 
 
 def rank_search_results(
@@ -120,21 +125,29 @@ def rank_search_results(
             "depth": 0.1
         }
     
-    # Score each result
-    for result in results:
-        score = 0.0
-        
-        # Add scoring logic based on metadata
-        if "credibility" in result:
-            score += result["credibility"] * quality_weights["credibility"]
-        if "relevance" in result:
-            score += result["relevance"] * quality_weights["relevance"]
-        if "recency" in result:
-            score += result["recency"] * quality_weights["recency"]
-        if "depth" in result:
-            score += result["depth"] * quality_weights["depth"]
-        
-        result["quality_score"] = score
+    if not results:
+        return []
+    
+    # Score all results at once: one column per quality factor
+    scores = np.zeros(len(results))
+    for factor in _QUALITY_FACTORS:
+        # Factors missing from caller-supplied weights do not count
+        weight = quality_weights.get(factor, 0.0)
+        if not weight:
+            continue
+        values = np.fromiter(
+            (result.get(factor, 0.0) for result in results),
+            dtype=np.float64,
+            count=len(results)
+        )
+        scores += values * weight
+    
+    # Stable descending sort keeps the original order for ties
+    order = np.argsort(-scores, kind="stable")
+    ranked = []
+    for i in order:
+        result = results[i]
+        result["quality_score"] = float(scores[i])
+        ranked.append(result)
     
-    # Sort by quality score
-    return sorted(results, key=lambda x: x.get("quality_score", 0), reverse=True)
+    return ranked
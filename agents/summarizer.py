@@ -3,8 +3,11 @@ Summarizer Agent - Specialized agent for content summarization.
 """
 from typing import List, Dict, Any
 from google import genai
+from google.genai import types
 from google.adk import Agent
 
+from agents.base import build_agent
+
 SUMMARIZER_PROMPT = """
 You are a Summarizer Agent specialized in extracting and synthesizing key information.
 
@@ -23,12 +26,11 @@ Quality standards:
 - Attribution: Note which sources support each claim
 """
 
+SUMMARIZER_CONFIG = types.GenerateContentConfig(temperature=0.3, top_p=0.8, max_output_tokens=2048)
+
 def create_summarizer_agent(client: genai.Client, tools: List[Any]) -> Agent:
     """Create summarizer agent."""
-    return Agent(
-        name="summarizer_agent",
-        model="gemini-1.5-pro",
-        instruction=SUMMARIZER_PROMPT,
-        tools=tools,
-        generate_content_config={"temperature": 0.3, "top_p": 0.8, "max_output_tokens": 2048}
+    return build_agent(
+        "summarizer_agent", client, "gemini-1.5-pro", SUMMARIZER_PROMPT, SUMMARIZER_CONFIG,
+        tools=tools
     )
@@ -2,13 +2,16 @@
 ResearchPro Evaluation Module
 """
 
-from evaluation.test_cases import TestCase, TEST_CASES
+from evaluation.test_cases import TestCase, TestCaseBatch, TEST_CASES
 from evaluation.metrics import EvaluationMetrics
 from evaluation.benchmarks import PerformanceBenchmark
+from evaluation.replay_cache import ReplayCache
 
 __all__ = [
     'TestCase',
+    'TestCaseBatch',
     'TEST_CASES',
     'EvaluationMetrics',
     'PerformanceBenchmark',
+    'ReplayCache',
 ]
@@ -1,7 +1,16 @@
 """
 Evaluation Metrics - Quality assessment metrics.
 """
-from typing import Dict, Any, List
+import re
+from functools import lru_cache
+from typing import Dict, Any, FrozenSet, List
+
+_CITATION_RE = re.compile(r'\[\d+\]')
+
+@lru_cache(maxsize=256)
+def _truth_terms(truth: str) -> FrozenSet[str]:
+    """Token set of a ground-truth string, shared across evaluations."""
+    return frozenset(truth.lower().split())
 
 class EvaluationMetrics:
     """Metrics for evaluating agent performance."""
@@ -9,14 +18,14 @@ class EvaluationMetrics:
     @staticmethod
     def factual_accuracy(generated: str, truth: str) -> float:
         """Evaluate factual accuracy against ground truth."""
-        gen_terms = set(generated.lower().split())
-        truth_terms = set(truth.lower().split())
-        overlap = len(gen_terms & truth_terms)
-        return overlap / len(truth_terms) if truth_terms else 0
+        truth_terms = _truth_terms(truth)
+        if not truth_terms:
+            return 0
+        overlap = len(truth_terms.intersection(generated.lower().split()))
+        return overlap / len(truth_terms)
     
     @staticmethod
     def citation_completeness(content: str, sources: List[Dict[str, Any]]) -> float:
         """Evaluate citation completeness."""
-        import re
-        citations = len(re.findall(r'\[\d+\]', content))
+        citations = len(_CITATION_RE.findall(content))
         return min(citations / len(sources), 1.0) if sources else 0
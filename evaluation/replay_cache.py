@@ -0,0 +1,59 @@
+"""
+Replay Cache - Persistent cache of research results for benchmark replays.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from typing import Dict, Any, Optional
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "llm.db")
+
+class ReplayCache:
+    """
+    SQLite-backed cache shared across processes and runs.
+
+    Payloads are stored as zlib-compressed JSON and expire after `ttl_days`.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl_days: float = 7):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.ttl_seconds = ttl_days * 24 * 60 * 60
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, expires_at REAL NOT NULL, payload BLOB NOT NULL)"
+        )
+
+    @staticmethod
+    def make_key(**request: Any) -> str:
+        """SHA256 of the request arguments."""
+        raw = json.dumps(request, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached value, or None if missing or expired."""
+        row = self._conn.execute(
+            "SELECT payload FROM responses WHERE key = ? AND expires_at > ?",
+            (key, time.time())
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(zlib.decompress(row[0]))
+
+    def set(self, key: str, value: Dict[str, Any]):
+        """Store a value under key."""
+        payload = zlib.compress(json.dumps(value, default=str).encode())
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, expires_at, payload) VALUES (?, ?, ?)",
+                (key, time.time() + self.ttl_seconds, payload)
+            )
+
+    def close(self):
+        """Close the underlying database connection."""
+        self._conn.close()
@@ -1,14 +1,40 @@
 """
 Test Cases - Evaluation test suite.
 """
-from typing import Dict, Any, List
+from dataclasses import dataclass
+from typing import Any, List, Mapping, Sequence
 
+import numpy as np
+
+@dataclass(frozen=True, slots=True)
 class TestCase:
     """Represents a single evaluation test case."""
-    def __init__(self, test_id: str, query: str, expected: Dict[str, Any]):
-        self.test_id = test_id
-        self.query = query
-        self.expected_output = expected
+    test_id: str
+    query: str
+    expected_output: Mapping[str, Any]
+
+@dataclass(frozen=True, slots=True)
+class TestCaseBatch:
+    """Expected thresholds for a suite of test cases, one array per field."""
+    test_ids: List[str]
+    min_sources: np.ndarray
+    min_quality: np.ndarray
+
+    @classmethod
+    def from_cases(cls, cases: Sequence[TestCase]) -> "TestCaseBatch":
+        """Build a batch from individual test cases."""
+        return cls(
+            test_ids=[tc.test_id for tc in cases],
+            min_sources=np.array([tc.expected_output["min_sources"] for tc in cases], dtype=np.int32),
+            min_quality=np.array([tc.expected_output["min_quality"] for tc in cases], dtype=np.float32)
+        )
+
+    def passed(self, sources: Sequence[int], quality_scores: Sequence[float]) -> np.ndarray:
+        """Boolean array of which test cases met both thresholds."""
+        return (
+            (np.asarray(sources) >= self.min_sources)
+            & (np.asarray(quality_scores, dtype=np.float32) >= self.min_quality)
+        )
 
 TEST_CASES = [
     TestCase("TC001", "What are recent AI breakthroughs?", {"min_sources": 5, "min_quality": 0.8}),
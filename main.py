@@ -9,35 +9,37 @@ Track: Agents for Good
 
 import os
 import asyncio
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+import heapq
+import time
+from functools import cached_property, lru_cache
+from operator import itemgetter
+from typing import Coroutine, List, Dict, Any, Optional, Set, Tuple
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
 # ADK imports
-from google import genai
 from google.genai import types
 from google.adk import Agent, Runner
-from google.adk.tools.google_search_tool import GoogleSearchTool
+from google.adk.apps import App
+from google.adk.tools import google_search
 from google.adk.sessions import InMemorySessionService
 from google.adk.memory import InMemoryMemoryService
 
 # Local imports
-from agents.orchestrator import create_orchestrator_agent
-from agents.search_agent import create_search_agent
-from agents.summarizer import create_summarizer_agent
-from agents.fact_checker import create_fact_checker_agent
-from agents.report_generator import create_report_generator_agent
+from agents.client import get_shared_client
+from agents.orchestrator import create_app, create_research_team
 
 from tools.academic_search import AcademicSearchTool
 from tools.citation_tool import CitationFormatterTool
 from tools.quality_scorer import QualityScorerTool
 
 from services.session_service import ResearchSessionService
+from services.session_backends import RedisBackend
 from services.memory_service import ResearchMemoryService
 from services.state_manager import ResearchStateManager
+from services.semantic_cache import SemanticCache, encoder_available
 
 from observability.logging_config import setup_logging
 from observability.tracing import setup_tracing
@@ -48,6 +50,80 @@ logger = setup_logging()
 tracer = setup_tracing()
 metrics = MetricsCollector()
 
+_title_and_url = itemgetter("title", "url")
+
+def _source_fields(source: Dict[str, Any]) -> Tuple[str, str, float]:
+    """(title, url, confidence) of a source, for report listings."""
+    return (*_title_and_url(source), source.get("confidence_score", 0))
+
+# Bounds on the source context passed to agents
+MAX_LLM_SOURCES = 10
+MAX_SNIPPET_CHARS = 400
+MIN_SOURCE_CONFIDENCE = 0.7
+
+def _sources_for_llm(sources: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Most confident sources, trimmed to what agents need to see."""
+    confident = [s for s in sources if s.get("confidence_score", 0) >= MIN_SOURCE_CONFIDENCE]
+    top = heapq.nlargest(MAX_LLM_SOURCES, confident, key=itemgetter("confidence_score"))
+    return [
+        {
+            "title": s.get("title", ""),
+            "url": s.get("url", ""),
+            "snippet": s.get("snippet", "")[:MAX_SNIPPET_CHARS],
+            "confidence_score": s["confidence_score"]
+        }
+        for s in top
+    ]
+
+@lru_cache(maxsize=1024)
+def _cached_angles(key: str) -> Tuple[str, ...]:
+    """
+    Search angle templates for a normalized query, memoized across requests.
+    
+    Templates hold a {query} placeholder, so queries that differ only in
+    case or surrounding whitespace share an entry while each caller still
+    gets angles built from its own query text.
+    """
+    # In production, use LLM to generate angles
+    # For now, simple variations
+    return (
+        "{query} recent research",
+        "{query} academic papers",
+        "{query} expert analysis"
+    )
+
+# Each summarization iteration drafts one candidate per focus
+_SUMMARY_FOCUSES = (
+    "key findings",
+    "points of consensus and disagreement",
+    "open questions and limitations"
+)
+
+_REPORT_TEMPLATE = """
+# Research Report: {query}
+
+## Summary
+{summary_content}
+
+## Quality Metrics
+- Sources Analyzed: {sources_count}
+- Quality Score: {quality_score:.2%}
+- Iterations: {iterations}
+
+## Sources
+{formatted_sources}
+
+## Methodology
+This report was generated using a multi-agent research system with:
+- Parallel search across multiple sources
+- Fact-checking and validation
+- Iterative quality improvement
+- Automated citation formatting
+
+---
+Generated by ResearchPro AI Agent System
+"""
+
 
 class ResearchProSystem:
     """
@@ -68,7 +144,9 @@ class ResearchProSystem:
         api_key: Optional[str] = None,
         enable_memory: bool = True,
         enable_tracing: bool = True,
-        use_vertex_memory: bool = False
+        use_vertex_memory: bool = False,
+        enable_semantic_cache: Optional[bool] = None,
+        fact_check_concurrency: int = 8
     ):
         """
         Initialize the ResearchPro system.
@@ -78,6 +156,10 @@ class ResearchProSystem:
             enable_memory: Enable persistent memory across sessions
             enable_tracing: Enable distributed tracing
             use_vertex_memory: Use Vertex AI Memory Bank (requires GCP setup)
+            enable_semantic_cache: Reuse results for near-duplicate queries
+                (default: only if the optional sentence-transformers
+                package is installed)
+            fact_check_concurrency: Maximum fact checks in flight at once
         """
         logger.info("Initializing ResearchPro System")
         
@@ -86,10 +168,19 @@ class ResearchProSystem:
         if not self.api_key:
             raise ValueError("GOOGLE_API_KEY must be set")
         
-        self.client = genai.Client(api_key=self.api_key)
+        self.client = get_shared_client(self.api_key)
         
         # Initialize services
-        self.session_service = ResearchSessionService()
+        # Set SESSION_REDIS_URL to share sessions across workers and replicas
+        # Redis expires shared sessions itself, with the service's default TTLs
+        redis_url = os.getenv("SESSION_REDIS_URL")
+        self.session_service = ResearchSessionService(
+            backend=RedisBackend(
+                redis_url,
+                ttl_seconds=24 * 60 * 60,
+                completed_ttl_seconds=300
+            ) if redis_url else None
+        )
         
         if use_vertex_memory:
             # Use Vertex AI Memory Bank for production
@@ -99,12 +190,13 @@ class ResearchProSystem:
             self.memory_service = ResearchMemoryService(use_vertex=False)
         
         self.state_manager = ResearchStateManager()
+        if enable_semantic_cache is None:
+            enable_semantic_cache = encoder_available()
+        self.semantic_cache = SemanticCache() if enable_semantic_cache else None
+        self.fact_check_concurrency = fact_check_concurrency
+        self._bg_tasks: Set[asyncio.Task] = set()
         
-        # Initialize tools
-        self._initialize_tools()
-        
-        # Initialize agents
-        self._initialize_agents()
+        # Tools and agents are cached properties, built on first use
         
         # Metrics
         self.metrics = metrics
@@ -112,61 +204,78 @@ class ResearchProSystem:
         
         logger.info("ResearchPro System initialized successfully")
     
-    def _initialize_tools(self):
-        """Initialize all tools available to agents."""
-        logger.info("Initializing tools")
-
-        # Built-in tools
-        self.google_search = GoogleSearchTool()
-        # Note: CodeExecutionTool not available in google.adk.tools
-        # Consider using FunctionTool or another alternative
-        # self.code_executor = CodeExecutionTool()
-
-        # Custom tools
-        self.academic_search = AcademicSearchTool()
-        self.citation_formatter = CitationFormatterTool()
-        self.quality_scorer = QualityScorerTool()
-
-        logger.info("Tools initialized")
+    def _run_in_background(self, coro: Coroutine[Any, Any, Any]):
+        """Schedule work that the caller does not wait for; see close()."""
+        task = asyncio.create_task(coro)
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
+    
+    async def close(self):
+        """Wait for outstanding background work, e.g. memory writes, and stop the session sweeper."""
+        results = await asyncio.gather(*self._bg_tasks, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Background task failed: {result}")
+        self.session_service.close()
+    
+    # Built-in tools (ADK's shared instance, so agent trees can be reused)
+    # Note: CodeExecutionTool not available in google.adk.tools
+    # Consider using FunctionTool or another alternative
+    @cached_property
+    def google_search(self):
+        return google_search
+    
+    # Custom tools
+    @cached_property
+    def academic_search(self) -> AcademicSearchTool:
+        return AcademicSearchTool()
+    
+    @cached_property
+    def citation_formatter(self) -> CitationFormatterTool:
+        return CitationFormatterTool()
     
-    def _initialize_agents(self):
-        """Initialize all specialized agents."""
+    @cached_property
+    def quality_scorer(self) -> QualityScorerTool:
+        return QualityScorerTool()
+    
+    @cached_property
+    def orchestrator(self) -> Agent:
+        """Orchestrator with all specialized sub-agents."""
         logger.info("Initializing agents")
-        
-        # Create specialized agents
         # Note: Custom tools (academic_search) need to be wrapped as BaseTool instances
         # For now, only using google_search which is a built-in tool
-        self.search_agent = create_search_agent(
-            client=self.client,
-            tools=[self.google_search]
-        )
-        
-        self.summarizer_agent = create_summarizer_agent(
-            client=self.client,
-            tools=[]
-        )
-        
-        self.fact_checker_agent = create_fact_checker_agent(
-            client=self.client,
-            tools=[self.google_search]
-        )
-        
-        self.report_generator_agent = create_report_generator_agent(
+        return create_research_team(
             client=self.client,
-            tools=[]
-        )
-        
-        # Create orchestrator with all sub-agents
-        self.orchestrator = create_orchestrator_agent(
-            client=self.client,
-            search_agent=self.search_agent,
-            summarizer_agent=self.summarizer_agent,
-            fact_checker_agent=self.fact_checker_agent,
-            report_generator_agent=self.report_generator_agent,
-            quality_scorer=self.quality_scorer
+            search_tools=[self.google_search],
+            fact_check_tools=[self.google_search]
         )
+    
+    @cached_property
+    def search_agent(self) -> Agent:
+        return self.orchestrator.find_sub_agent("search_agent")
+    
+    @cached_property
+    def summarizer_agent(self) -> Agent:
+        return self.orchestrator.find_sub_agent("summarizer_agent")
+    
+    @cached_property
+    def fact_checker_agent(self) -> Agent:
+        return self.orchestrator.find_sub_agent("fact_checker_agent")
+    
+    @cached_property
+    def report_generator_agent(self) -> Agent:
+        return self.orchestrator.find_sub_agent("report_generator_agent")
+    
+    @cached_property
+    def app(self) -> App:
+        """
+        ADK app wrapping the orchestrator, for deployment.
         
-        logger.info("Agents initialized")
+        Deployed sessions are multi-turn, so the orchestrator's static
+        prompt is served from the context cache after the first turns
+        (see agents.orchestrator.create_app).
+        """
+        return create_app(self.orchestrator)
     
     async def research(
         self,
@@ -190,7 +299,7 @@ class ResearchProSystem:
             Dictionary containing research results, report, and metadata
         """
         # Start metrics collection
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         self.metrics.increment_counter("research_requests_total")
         
         with tracer.start_as_current_span("research_request") as span:
@@ -213,48 +322,66 @@ class ResearchProSystem:
                     session_id = session["session_id"]
                     logger.info(f"Created new session: {session_id}")
                 
-                # Retrieve relevant memories
-                memories = await self.memory_service.search_memories(
-                    user_id=user_id,
-                    query=query
-                )
-                
-                logger.info(f"Retrieved {len(memories)} relevant memories")
-                
-                # Prepare context for orchestrator
-                context = {
-                    "query": query,
-                    "user_id": user_id,
-                    "session_id": session_id,
-                    "max_sources": max_sources,
-                    "memories": memories,
-                    "require_approval": require_approval,
-                    "research_preferences": self._get_user_preferences(user_id)
-                }
-                
-                # Execute research workflow through orchestrator
-                logger.info("Executing research workflow")
-                
-                result = await self._execute_research_workflow(
-                    context=context,
-                    session=session
-                )
-                
-                # Store findings in memory
-                await self._store_research_memory(
-                    user_id=user_id,
-                    query=query,
-                    result=result
-                )
-                
-                # Update session
-                self.session_service.update_session(
-                    session_id=session_id,
-                    result=result
-                )
+                # Keep the session from being evicted until its result is stored
+                with self.session_service.in_use(session_id):
+                    # Retrieve relevant memories
+                    memories = await self.memory_service.search_memories(
+                        user_id=user_id,
+                        query=query
+                    )
+                    
+                    logger.info(f"Retrieved {len(memories)} relevant memories")
+                    
+                    # Prepare context for orchestrator
+                    context = {
+                        "query": query,
+                        "user_id": user_id,
+                        "session_id": session_id,
+                        "max_sources": max_sources,
+                        "memories": memories,
+                        "require_approval": require_approval,
+                        "research_preferences": self._get_user_preferences(user_id)
+                    }
+                    
+                    # Near-duplicate queries reuse a previous result, but only
+                    # one built for the same user and source limit
+                    cache_scope = (user_id, max_sources)
+                    cached = (
+                        await self.semantic_cache.lookup(query, cache_scope)
+                        if self.semantic_cache is not None else None
+                    )
+                    
+                    if cached is not None:
+                        logger.info("Semantic cache hit, reusing previous research result")
+                        self.metrics.increment_counter("semantic_cache_hits")
+                        result = cached
+                    else:
+                        # Execute research workflow through orchestrator
+                        logger.info("Executing research workflow")
+                        
+                        result = await self._execute_research_workflow(
+                            context=context,
+                            session=session
+                        )
+                        
+                        # Store findings in memory off the response path
+                        self._run_in_background(self._store_research_memory(
+                            user_id=user_id,
+                            query=query,
+                            result=result
+                        ))
+                        
+                        if self.semantic_cache is not None and result.get("status") == "completed":
+                            await self.semantic_cache.put(query, result, cache_scope)
+                    
+                    # Update session
+                    self.session_service.update_session(
+                        session_id=session_id,
+                        result=result
+                    )
                 
                 # Record metrics
-                duration = (datetime.now() - start_time).total_seconds()
+                duration = time.perf_counter() - start_time
                 self.metrics.record_histogram(
                     "research_duration_seconds",
                     duration
@@ -300,22 +427,37 @@ class ResearchProSystem:
         """
         with tracer.start_as_current_span("research_workflow") as span:
             
+            # Phases 1 and 2 run as a pipeline: each unique source is handed
+            # to fact checking as soon as its search returns
+            sources = asyncio.Queue(maxsize=32)
+            
             # Phase 1: Parallel Search
             logger.info("Phase 1: Parallel search across multiple sources")
-            search_results = await self._parallel_search(
+            search_task = asyncio.create_task(self._parallel_search(
                 query=context["query"],
-                max_sources=context["max_sources"]
-            )
-            span.set_attribute("sources_found", len(search_results))
+                max_sources=context["max_sources"],
+                sink=sources
+            ))
             
             # Phase 2: Fact Checking
             logger.info("Phase 2: Fact checking and validation")
-            validated_results = await self._fact_check_results(search_results)
+            check_task = asyncio.create_task(self._fact_check_results(sources))
+            
+            try:
+                search_results, validated_results = await asyncio.gather(search_task, check_task)
+            except BaseException:
+                search_task.cancel()
+                check_task.cancel()
+                raise
+            span.set_attribute("sources_found", len(search_results))
             
             # Phase 3: Iterative Summarization (Loop until quality threshold)
             logger.info("Phase 3: Iterative summarization with quality loop")
+            # Agents only see a bounded view of the sources, so prompt size
+            # does not grow with the number of results
+            context["sources_for_llm"] = _sources_for_llm(validated_results)
             summary = await self._iterative_summarization(
-                results=validated_results,
+                results=context["sources_for_llm"],
                 min_quality_score=0.8
             )
             
@@ -356,50 +498,60 @@ class ResearchProSystem:
     async def _parallel_search(
         self,
         query: str,
-        max_sources: int
+        max_sources: int,
+        sink: Optional[asyncio.Queue] = None
     ) -> List[Dict[str, Any]]:
         """
         Execute parallel searches across multiple search agents.
         
         Demonstrates: Parallel agent execution
+        
+        Args:
+            query: Research query
+            max_sources: Maximum number of unique sources to return
+            sink: Optional queue that receives each unique source as soon as
+                its search completes, followed by a None sentinel
+        
+        Returns:
+            Unique sources in the order they arrived
         """
         with tracer.start_as_current_span("parallel_search"):
             # Split query into multiple search angles
             search_angles = self._generate_search_angles(query)
             
             # Create parallel search tasks
-            search_tasks = []
-            for angle in search_angles[:3]:  # Max 3 parallel searches
-                task = self._search_with_agent(angle, max_sources // 3)
-                search_tasks.append(task)
+            search_tasks = [
+                asyncio.create_task(self._search_with_agent(angle, max_sources // 3))
+                for angle in search_angles[:3]  # Max 3 parallel searches
+            ]
             
-            # Execute searches in parallel
+            # Combine and deduplicate results as searches finish (first result per URL wins)
             logger.info(f"Executing {len(search_tasks)} parallel searches")
-            results = await asyncio.gather(*search_tasks)
-            
-            # Combine and deduplicate results
-            all_results = []
-            seen_urls = set()
+            unique = {}
+            try:
+                for next_done in asyncio.as_completed(search_tasks):
+                    for result in await next_done:
+                        url = result.get("url")
+                        if url and url not in unique and len(unique) < max_sources:
+                            unique[url] = result
+                            if sink is not None:
+                                await sink.put(result)
+                    if len(unique) >= max_sources:
+                        break
+            finally:
+                for task in search_tasks:
+                    task.cancel()
             
-            for result_list in results:
-                for result in result_list:
-                    url = result.get("url")
-                    if url and url not in seen_urls:
-                        all_results.append(result)
-                        seen_urls.add(url)
+            if sink is not None:
+                await sink.put(None)
             
-            logger.info(f"Found {len(all_results)} unique sources")
-            return all_results[:max_sources]
+            logger.info(f"Found {len(unique)} unique sources")
+            return list(unique.values())
     
     def _generate_search_angles(self, query: str) -> List[str]:
         """Generate multiple search perspectives for parallel execution."""
-        # In production, use LLM to generate angles
-        # For now, simple variations
-        return [
-            f"{query} recent research",
-            f"{query} academic papers",
-            f"{query} expert analysis"
-        ]
+        query = query.strip()
+        return [angle.format(query=query) for angle in _cached_angles(query.lower())]
     
     async def _search_with_agent(
         self,
@@ -421,21 +573,41 @@ class ResearchProSystem:
     
     async def _fact_check_results(
         self,
-        results: List[Dict[str, Any]]
+        results: asyncio.Queue
     ) -> List[Dict[str, Any]]:
-        """Validate results using fact checker agent."""
+        """
+        Validate results using fact checker agent.
+        
+        Consumes results from the queue until a None sentinel, starting each
+        check as soon as its result arrives.
+        """
         with tracer.start_as_current_span("fact_checking"):
-            logger.info(f"Fact checking {len(results)} results")
+            # Each check is an independent LLM round trip, so run them
+            # concurrently, bounded to stay within rate limits
+            semaphore = asyncio.Semaphore(self.fact_check_concurrency)
             
-            # In production, use actual fact checker agent
-            # For now, simulate validation
-            validated = []
-            for result in results:
-                result["validated"] = True
-                result["confidence_score"] = 0.85
-                validated.append(result)
+            async def check_one(result: Dict[str, Any]) -> Dict[str, Any]:
+                async with semaphore:
+                    return await self._validate_result(result)
             
-            return validated
+            checks = []
+            try:
+                while (result := await results.get()) is not None:
+                    checks.append(asyncio.create_task(check_one(result)))
+                logger.info(f"Fact checking {len(checks)} results")
+                return list(await asyncio.gather(*checks))
+            except BaseException:
+                for task in checks:
+                    task.cancel()
+                raise
+    
+    async def _validate_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate a single result using fact checker agent."""
+        # In production, use actual fact checker agent
+        # For now, simulate validation
+        result["validated"] = True
+        result["confidence_score"] = 0.85
+        return result
     
     async def _iterative_summarization(
         self,
@@ -458,11 +630,19 @@ class ResearchProSystem:
                 iteration += 1
                 logger.info(f"Summarization iteration {iteration}")
                 
-                # Generate/refine summary
-                summary = await self._generate_summary(results, summary)
+                # Generate/refine one candidate per focus concurrently and keep
+                # the best, so a weak draft costs no extra round trip
+                candidates = await asyncio.gather(*(
+                    self._generate_summary(results, summary, focus)
+                    for focus in _SUMMARY_FOCUSES
+                ))
                 
                 # Evaluate quality
-                quality_score = await self._evaluate_summary_quality(summary)
+                scores = await asyncio.gather(*(
+                    self._evaluate_summary_quality(candidate)
+                    for candidate in candidates
+                ))
+                quality_score, summary = max(zip(scores, candidates), key=itemgetter(0))
                 
                 logger.info(f"Quality score: {quality_score:.2f}")
                 
@@ -481,15 +661,17 @@ class ResearchProSystem:
     async def _generate_summary(
         self,
         results: List[Dict[str, Any]],
-        previous_summary: Optional[str] = None
+        previous_summary: Optional[str] = None,
+        focus: str = _SUMMARY_FOCUSES[0]
     ) -> str:
-        """Generate or refine summary using summarizer agent."""
-        # In production, use actual summarizer agent
+        """Generate or refine summary using summarizer agent, emphasizing `focus`."""
+        # In production, use actual summarizer agent, asking it to
+        # "emphasize {focus}" so each concurrent candidate takes a different angle
         # For now, simulate
         if previous_summary:
-            return f"Refined summary based on {len(results)} sources"
+            return f"Refined summary of {focus} based on {len(results)} sources"
         else:
-            return f"Initial summary based on {len(results)} sources"
+            return f"Initial summary of {focus} based on {len(results)} sources"
     
     async def _evaluate_summary_quality(self, summary: str) -> float:
         """Evaluate summary quality using quality scorer tool."""
@@ -529,41 +711,21 @@ class ResearchProSystem:
         with tracer.start_as_current_span("report_generation"):
             # In production, use report generator agent
             # For now, simulate
-            report = f"""
-# Research Report: {query}
-
-## Summary
-{summary.get('content', '')}
-
-## Quality Metrics
-- Sources Analyzed: {len(sources)}
-- Quality Score: {summary.get('quality_score', 0):.2%}
-- Iterations: {summary.get('iterations', 1)}
-
-## Sources
-{self._format_sources(sources[:5])}
-
-## Methodology
-This report was generated using a multi-agent research system with:
-- Parallel search across multiple sources
-- Fact-checking and validation
-- Iterative quality improvement
-- Automated citation formatting
-
----
-Generated by ResearchPro AI Agent System
-"""
-            return report
+            return _REPORT_TEMPLATE.format_map({
+                "query": query,
+                "summary_content": summary.get("content", ""),
+                "sources_count": len(sources),
+                "quality_score": summary.get("quality_score", 0),
+                "iterations": summary.get("iterations", 1),
+                "formatted_sources": self._format_sources(sources[:5])
+            })
     
     def _format_sources(self, sources: List[Dict[str, Any]]) -> str:
         """Format sources for report."""
-        formatted = []
-        for i, source in enumerate(sources, 1):
-            formatted.append(
-                f"{i}. [{source['title']}]({source['url']}) - "
-                f"Confidence: {source.get('confidence_score', 0):.0%}"
-            )
-        return "\n".join(formatted)
+        return "\n".join(
+            f"{i}. [{title}]({url}) - Confidence: {confidence:.0%}"
+            for i, (title, url, confidence) in enumerate(map(_source_fields, sources), 1)
+        )
     
     async def _store_research_memory(
         self,
@@ -577,13 +739,12 @@ Generated by ResearchPro AI Agent System
         # Extract key facts to store
         facts = {
             "query": query,
-            "timestamp": datetime.now().isoformat(),
             "sources_count": result.get("sources_count", 0),
             "quality_score": result.get("quality_score", 0),
             "summary": result.get("summary", {}).get("content", "")[:500]
         }
         
-        await self.memory_service.store_memory(
+        self.memory_service.store_memory(
             user_id=user_id,
             memory_data=facts
         )
@@ -657,7 +818,15 @@ async def main():
         print(result['result'].get('report', ''))
     else:
         print(f"\n❌ Research Failed: {result['error']}")
+    
+    await system.close()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # Every workflow phase is network I/O, so prefer uvloop where available
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -4,14 +4,40 @@ Logging Configuration - Structured logging setup.
 import logging
 import sys
 
+try:
+    import orjson
+
+    def _dumps(payload) -> str:
+        return orjson.dumps(payload, default=str).decode()
+except ImportError:
+    import json
+
+    def _dumps(payload) -> str:
+        return json.dumps(payload, default=str, separators=(",", ":"))
+
+class JSONFormatter(logging.Formatter):
+    """Formats each record as one JSON object, escaping messages safely."""
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": self.formatTime(record),
+            "level": record.levelname,
+            "message": record.getMessage()
+        }
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return _dumps(payload)
+
 def setup_logging(level: str = "INFO") -> logging.Logger:
-    """Configure structured logging for the application."""
+    """
+    Configure structured logging for the application.
+    
+    Safe to call more than once; the handler is only attached the first time.
+    """
     logger = logging.getLogger("researchpro")
+    if logger.handlers:
+        return logger
     logger.setLevel(getattr(logging, level.upper()))
     handler = logging.StreamHandler(sys.stdout)
-    formatter = logging.Formatter(
-        '{"timestamp": "%(asctime)s", "level": "%(levelname)s", "message": "%(message)s"}'
-    )
-    handler.setFormatter(formatter)
+    handler.setFormatter(JSONFormatter())
     logger.addHandler(handler)
     return logger
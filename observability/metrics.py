@@ -2,28 +2,65 @@
 Metrics Collection - Custom metrics for monitoring.
 """
 from collections import defaultdict
+from dataclasses import dataclass
 from typing import Dict, Any
+import math
+import threading
+
+@dataclass(slots=True)
+class _RunningStats:
+    """Constant-size histogram summary, updated in place (Welford's algorithm)."""
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min: float = math.inf
+    max: float = -math.inf
+    
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+    
+    def summary(self) -> Dict[str, float]:
+        if not self.count:
+            return {"avg": 0, "count": 0}
+        return {
+            "avg": self.mean,
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+            "stddev": math.sqrt(self.m2 / self.count)
+        }
 
 class MetricsCollector:
     """Collect and track metrics for monitoring."""
     def __init__(self):
         self.counters = defaultdict(int)
-        self.histograms = defaultdict(list)
+        self.histograms = defaultdict(_RunningStats)
+        self._lock = threading.Lock()
     
     def increment_counter(self, name: str, value: int = 1):
         """Increment a counter metric."""
-        self.counters[name] += value
+        with self._lock:
+            self.counters[name] += value
     
     def record_histogram(self, name: str, value: float):
         """Record a value in a histogram."""
-        self.histograms[name].append(value)
+        with self._lock:
+            self.histograms[name].add(value)
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get all current metrics."""
-        return {
-            "counters": dict(self.counters),
-            "histograms": {
-                k: {"avg": sum(v)/len(v) if v else 0, "count": len(v)}
-                for k, v in self.histograms.items()
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "histograms": {
+                    k: v.summary()
+                    for k, v in self.histograms.items()
+                }
             }
-        }
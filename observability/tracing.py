@@ -1,24 +1,56 @@
 """
 Distributed Tracing - Track requests across agents.
 """
+import time
 import uuid
+from collections import deque
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, Deque, List, Dict, Any
+
+# Offset from the monotonic clock to wall-clock time, for exporting spans
+_EPOCH_OFFSET_NS = time.time_ns() - time.perf_counter_ns()
+
+def _to_datetime(perf_ns: int) -> datetime:
+    return datetime.fromtimestamp((perf_ns + _EPOCH_OFFSET_NS) / 1e9)
 
 class Span:
     """Represents a single unit of work in distributed tracing."""
     def __init__(self, name: str, parent: Optional['Span'] = None):
         self.name = name
         self.span_id = str(uuid.uuid4())[:8]
-        self.start_time = datetime.now()
-        self.end_time = None
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns: Optional[int] = None
         self.attributes = {}
     
+    @property
+    def start_time(self) -> datetime:
+        return _to_datetime(self.start_ns)
+    
+    @property
+    def end_time(self) -> Optional[datetime]:
+        return _to_datetime(self.end_ns) if self.end_ns is not None else None
+    
+    @property
+    def duration_ms(self) -> Optional[float]:
+        return (self.end_ns - self.start_ns) / 1e6 if self.end_ns is not None else None
+    
     def set_attribute(self, key: str, value: Any):
         self.attributes[key] = value
     
     def end(self):
-        self.end_time = datetime.now()
+        self.end_ns = time.perf_counter_ns()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Export the span with ISO timestamps."""
+        end_time = self.end_time
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "start_time": self.start_time.isoformat(),
+            "end_time": end_time.isoformat() if end_time else None,
+            "duration_ms": self.duration_ms,
+            "attributes": dict(self.attributes)
+        }
     
     def __enter__(self):
         return self
@@ -27,15 +59,30 @@ class Span:
         self.end()
 
 class Tracer:
-    """Simple distributed tracing implementation."""
-    def __init__(self):
-        self.spans: List[Span] = []
+    """
+    Simple distributed tracing implementation.
+    
+    Keeps at most `max_spans` recent spans; older ones are dropped.
+    """
+    def __init__(self, max_spans: int = 10_000):
+        self.max_spans = max_spans
+        self.spans: Deque[Span] = deque(maxlen=max_spans)
     
     def start_as_current_span(self, name: str) -> Span:
         span = Span(name)
         self.spans.append(span)
         return span
+    
+    def flush_spans(self) -> List[Dict[str, Any]]:
+        """Remove finished spans from the buffer and return them for export."""
+        finished = []
+        pending = []
+        while self.spans:
+            span = self.spans.popleft()
+            (finished if span.end_ns is not None else pending).append(span)
+        self.spans.extend(pending)
+        return [span.to_dict() for span in finished]
 
-def setup_tracing() -> Tracer:
+def setup_tracing(max_spans: int = 10_000) -> Tracer:
     """Setup distributed tracing."""
-    return Tracer()
+    return Tracer(max_spans=max_spans)
@@ -3,11 +3,17 @@ ResearchPro Services Module
 """
 
 from services.session_service import ResearchSessionService
+from services.session_backends import SessionBackend, InMemoryBackend, RedisBackend
 from services.memory_service import ResearchMemoryService
 from services.state_manager import ResearchStateManager
+from services.semantic_cache import SemanticCache
 
 __all__ = [
     'ResearchSessionService',
+    'SessionBackend',
+    'InMemoryBackend',
+    'RedisBackend',
     'ResearchMemoryService',
     'ResearchStateManager',
+    'SemanticCache',
 ]
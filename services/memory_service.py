@@ -1,38 +1,257 @@
 """
 Memory Service - Manage long-term memory across sessions.
 """
-from typing import Dict, Any, List
+from collections import Counter, OrderedDict, deque
+from typing import Dict, Any, Callable, Deque, FrozenSet, List, Optional, Set, Tuple
 from datetime import datetime
+import asyncio
+import heapq
+import json
+import logging
+import re
+import time
 import uuid
 
+import numpy as np
+
+from services.semantic_cache import encode
+
+logger = logging.getLogger("researchpro")
+
+_TOKEN_RE = re.compile(r"\w+")
+
+def _tokenize(text: str) -> FrozenSet[str]:
+    """Lowercased word tokens of text."""
+    return frozenset(_TOKEN_RE.findall(text.lower()))
+
+class _EmbeddingTable:
+    """One user's memory embeddings as rows of a matrix; freed rows are reused."""
+    
+    def __init__(self):
+        self.matrix: Optional[np.ndarray] = None
+        self.valid = np.zeros(0, dtype=bool)
+        self.size = 0
+        self.row_ids: List[Optional[int]] = []
+        self.rows: Dict[int, int] = {}
+        self.free: List[int] = []
+        # Ids of memories stored since the last search, not yet embedded
+        self.pending: List[int] = []
+    
+    def add(self, memory_id: int, vector: np.ndarray):
+        if self.free:
+            row = self.free.pop()
+            self.row_ids[row] = memory_id
+        else:
+            row = self.size
+            if self.matrix is None or row >= self.matrix.shape[0]:
+                # Grow by doubling so appends stay amortized O(1)
+                capacity = max(128, 2 * row)
+                grown = np.empty((capacity, vector.shape[0]), dtype=np.float32)
+                valid = np.zeros(capacity, dtype=bool)
+                if self.matrix is not None:
+                    grown[:row] = self.matrix[:row]
+                    valid[:row] = self.valid[:row]
+                self.matrix, self.valid = grown, valid
+            self.size += 1
+            self.row_ids.append(memory_id)
+        self.matrix[row] = vector
+        self.valid[row] = True
+        self.rows[memory_id] = row
+    
+    def remove(self, memory_id: int):
+        row = self.rows.pop(memory_id, None)
+        if row is not None:
+            self.valid[row] = False
+            self.row_ids[row] = None
+            self.free.append(row)
+    
+    def top(self, query_vector: np.ndarray, limit: int) -> List[int]:
+        """Ids of the `limit` memories most similar to the query."""
+        k = min(limit, len(self.rows))
+        if k <= 0:
+            return []
+        scores = self.matrix[:self.size] @ query_vector
+        scores[~self.valid[:self.size]] = -np.inf
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [self.row_ids[row] for row in top]
+
 class ResearchMemoryService:
-    """Manages long-term memory across sessions."""
+    """
+    Manages long-term memory across sessions.
+    
+    Memories are recalled by keyword overlap through an inverted index, or,
+    with use_embeddings, by cosine similarity of sentence embeddings. In that
+    mode each user's embeddings live in one float32 matrix, so a search is a
+    single matrix-vector product.
+    
+    Each user keeps at most `max_memories_per_user` memories, evicting the
+    least recently recalled first; with `ttl_seconds`, memories older than
+    that are dropped as well.
+    """
     
-    def __init__(self, use_vertex: bool = False):
+    def __init__(
+        self,
+        use_vertex: bool = False,
+        use_embeddings: bool = False,
+        encoder: Callable[[List[str]], np.ndarray] = encode,
+        max_memories_per_user: int = 1024,
+        ttl_seconds: Optional[float] = None
+    ):
         self.use_vertex = use_vertex
-        self._memories: Dict[str, List[Dict[str, Any]]] = {}
+        self.use_embeddings = use_embeddings
+        self.max_memories_per_user = max_memories_per_user
+        self.ttl_ns = int(ttl_seconds * 1e9) if ttl_seconds is not None else None
+        self._encoder = encoder
+        # user_id -> memory id -> memory, least recently recalled first
+        self._memories: Dict[str, "OrderedDict[int, Dict[str, Any]]"] = {}
+        # user_id -> (created_ns, memory id) in creation order, for TTL expiry;
+        # only kept when a TTL is set
+        self._created: Dict[str, Deque[Tuple[int, int]]] = {}
+        self._tables: Dict[str, _EmbeddingTable] = {}
+        # user_id -> term -> ids of that user's memories containing the term
+        self._index: Dict[str, Dict[str, Set[int]]] = {}
+        # memory id -> token set, computed once at store time. Kept out of the
+        # memory dicts themselves because those are rendered into prompts.
+        self._tokens: Dict[int, FrozenSet[str]] = {}
     
-    async def store_memory(self, user_id: str, memory_data: Dict[str, Any]):
+    def store_memory(self, user_id: str, memory_data: Dict[str, Any]):
         """Store a memory for a user."""
         if user_id not in self._memories:
-            self._memories[user_id] = []
+            self._memories[user_id] = OrderedDict()
+            if self.ttl_ns is not None:
+                self._created[user_id] = deque()
         memory = {
-            "id": str(uuid.uuid4()),
+            "id": uuid.uuid4().int,
             "user_id": user_id,
-            "created_at": datetime.now().isoformat(),
+            "created_ns": time.time_ns(),
             "data": memory_data
         }
-        self._memories[user_id].append(memory)
+        memory_id = memory["id"]
+        memories = self._memories[user_id]
+        memories[memory_id] = memory
+        if self.ttl_ns is not None:
+            self._created[user_id].append((memory["created_ns"], memory_id))
+        
+        # Tokenize once at write time so searches only touch posting lists
+        tokens = self._tokens[memory_id] = _tokenize(json.dumps(memory_data, default=str))
+        user_index = self._index.setdefault(user_id, {})
+        for token in tokens:
+            user_index.setdefault(token, set()).add(memory_id)
+        
+        if self.use_embeddings:
+            self._tables.setdefault(user_id, _EmbeddingTable()).pending.append(memory_id)
+        
+        while len(memories) > self.max_memories_per_user:
+            self._remove(user_id, next(iter(memories)))
+    
+    def _remove(self, user_id: str, memory_id: int):
+        """Drop a memory and its index and embedding entries."""
+        self._memories[user_id].pop(memory_id, None)
+        tokens = self._tokens.pop(memory_id)
+        user_index = self._index[user_id]
+        for token in tokens:
+            postings = user_index[token]
+            postings.discard(memory_id)
+            if not postings:
+                del user_index[token]
+        table = self._tables.get(user_id)
+        if table is not None:
+            table.remove(memory_id)
+        
+        # Evicted ids linger in the creation queue until their TTL; compact it
+        # once they outnumber the live ones, keeping it O(memories) in size
+        created = self._created.get(user_id)
+        memories = self._memories[user_id]
+        if created is not None and len(created) > 2 * len(memories) + 16:
+            self._created[user_id] = deque(
+                entry for entry in created if entry[1] in memories
+            )
+    
+    def _expire(self, user_id: str):
+        """Drop the user's memories older than the TTL."""
+        if self.ttl_ns is None or user_id not in self._created:
+            return
+        cutoff = time.time_ns() - self.ttl_ns
+        created = self._created[user_id]
+        memories = self._memories[user_id]
+        while created and created[0][0] < cutoff:
+            _, memory_id = created.popleft()
+            if memory_id in memories:
+                self._remove(user_id, memory_id)
+    
+    def export_memories(self, user_id: str) -> List[Dict[str, Any]]:
+        """A user's memories with ISO-formatted creation times, for display or export."""
+        self._expire(user_id)
+        return [
+            {**memory, "created_at": datetime.fromtimestamp(memory["created_ns"] / 1e9).isoformat()}
+            for memory in self._memories.get(user_id, {}).values()
+        ]
     
     async def search_memories(self, user_id: str, query: str, limit: int = 5) -> List[Dict[str, Any]]:
         """Search memories for relevant information."""
-        user_memories = self._memories.get(user_id, [])
-        query_terms = set(query.lower().split())
-        scored = []
-        for memory in user_memories:
-            text = str(memory["data"]).lower()
-            score = sum(1 for term in query_terms if term in text) / len(query_terms) if query_terms else 0
-            if score > 0:
-                scored.append((score, memory))
-        scored.sort(reverse=True, key=lambda x: x[0])
-        return [m for _, m in scored[:limit]]
+        self._expire(user_id)
+        memories = self._memories.get(user_id)
+        if not memories:
+            return []
+        
+        if self.use_embeddings:
+            try:
+                best = await self._search_embeddings(user_id, query, limit)
+            except ImportError:
+                logger.warning("sentence-transformers not installed; falling back to keyword recall")
+                self.use_embeddings = False
+                self._tables.clear()
+            else:
+                return self._recall(memories, best)
+        
+        query_terms = _tokenize(query)
+        user_index = self._index.get(user_id)
+        if not query_terms or not user_index:
+            return []
+        
+        # A memory's score is the fraction of query terms it contains, so
+        # counting its occurrences across the query's posting lists ranks it
+        # without touching any memory text
+        hits = Counter()
+        for term in query_terms:
+            hits.update(user_index.get(term, ()))
+        
+        def rank(memory_id: int) -> Tuple[int, int]:
+            # Earlier memories win ties
+            return hits[memory_id], -memories[memory_id]["created_ns"]
+        
+        return self._recall(memories, heapq.nlargest(limit, hits, key=rank))
+    
+    @staticmethod
+    def _recall(memories: "OrderedDict[int, Dict[str, Any]]", memory_ids: List[int]) -> List[Dict[str, Any]]:
+        """Return the memories, marking them most recently used."""
+        recalled = []
+        for memory_id in memory_ids:
+            if memory_id in memories:
+                memories.move_to_end(memory_id)
+                recalled.append(memories[memory_id])
+        return recalled
+    
+    async def _embed_pending(self, user_id: str):
+        """Embed memories stored since the last search, in one batch off the event loop."""
+        table = self._tables.setdefault(user_id, _EmbeddingTable())
+        memories = self._memories[user_id]
+        pending = [memory_id for memory_id in table.pending if memory_id in memories]
+        table.pending = []
+        if not pending:
+            return
+        
+        texts = [json.dumps(memories[memory_id]["data"], default=str) for memory_id in pending]
+        vectors = await asyncio.to_thread(self._encoder, texts)
+        
+        # Memories evicted while encoding are skipped
+        for memory_id, vector in zip(pending, vectors):
+            if memory_id in memories:
+                table.add(memory_id, vector)
+    
+    async def _search_embeddings(self, user_id: str, query: str, limit: int) -> List[int]:
+        """Ids of the user's memories ranked by embedding similarity to the query."""
+        await self._embed_pending(user_id)
+        query_vector = (await asyncio.to_thread(self._encoder, [query]))[0]
+        return self._tables[user_id].top(query_vector, limit)
@@ -0,0 +1,129 @@
+"""
+Semantic Cache - Reuse research results for near-identical queries.
+"""
+from collections import OrderedDict
+from copy import deepcopy
+from typing import Dict, Any, Callable, Hashable, List, Optional, Set, Tuple
+import asyncio
+import importlib.util
+import logging
+
+import numpy as np
+
+logger = logging.getLogger("researchpro")
+
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+_encoder = None
+
+def encoder_available() -> bool:
+    """Whether sentence-transformers, which the default encoder needs, is installed."""
+    return importlib.util.find_spec("sentence_transformers") is not None
+
+def encode(texts: List[str]) -> np.ndarray:
+    """
+    Embed texts as L2-normalized float32 rows.
+
+    Loads the sentence-transformers model on first use; raises ImportError
+    if sentence-transformers is not installed.
+    """
+    global _encoder
+    if _encoder is None:
+        from sentence_transformers import SentenceTransformer
+        _encoder = SentenceTransformer(EMBEDDING_MODEL)
+    embeddings = _encoder.encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+    return embeddings.astype(np.float32, copy=False)
+
+class SemanticCache:
+    """
+    Caches results keyed by query embedding.
+
+    A lookup is a single matrix-vector product against the cached query
+    embeddings of the same scope (e.g. user and request options); the best
+    match is returned if its cosine similarity reaches the threshold. The
+    least recently used entry is overwritten once the cache is full.
+    
+    Embedding runs in a worker thread so the event loop is never blocked,
+    and any encoder failure is treated as a cache miss. Results are
+    deep-copied in and out, so callers cannot alter cached entries.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.87,
+        capacity: int = 1024,
+        encoder: Callable[[List[str]], np.ndarray] = encode
+    ):
+        self.threshold = threshold
+        self.capacity = capacity
+        self.enabled = True
+        self._encoder = encoder
+        self._embeddings: Optional[np.ndarray] = None
+        # Row index -> (scope, cached result), least recently used first
+        self._entries: "OrderedDict[int, Tuple[Hashable, Dict[str, Any]]]" = OrderedDict()
+        # Scope -> rows cached under it
+        self._scope_rows: Dict[Hashable, Set[int]] = {}
+        self._last: Optional[Tuple[str, np.ndarray]] = None
+
+    async def _embed(self, query: str) -> Optional[np.ndarray]:
+        """Embed a query, reusing the vector from the previous call."""
+        if self._last is not None and self._last[0] == query:
+            return self._last[1]
+        try:
+            vector = (await asyncio.to_thread(self._encoder, [query]))[0]
+        except ImportError:
+            logger.warning("sentence-transformers not installed; semantic cache disabled")
+            self.enabled = False
+            return None
+        except Exception as e:
+            logger.warning(f"Query embedding failed, skipping semantic cache: {e}")
+            return None
+        self._last = (query, vector)
+        return vector
+
+    async def lookup(self, query: str, scope: Hashable = None) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached result for the most similar query in scope, if similar enough."""
+        if not self.enabled or not self._scope_rows.get(scope):
+            return None
+        vector = await self._embed(query)
+        # Re-read the scope: entries may have changed while embedding
+        rows = self._scope_rows.get(scope)
+        if vector is None or not rows:
+            return None
+
+        rows = np.fromiter(rows, dtype=np.intp, count=len(rows))
+        scores = self._embeddings[rows] @ vector
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+
+        row = int(rows[best])
+        self._entries.move_to_end(row)
+        return deepcopy(self._entries[row][1])
+
+    async def put(self, query: str, result: Dict[str, Any], scope: Hashable = None):
+        """Cache a copy of a result under the query's embedding and scope."""
+        if not self.enabled:
+            return
+        vector = await self._embed(query)
+        if vector is None:
+            return
+
+        if self._embeddings is None:
+            self._embeddings = np.zeros((self.capacity, vector.shape[0]), dtype=np.float32)
+
+        if len(self._entries) < self.capacity:
+            row = len(self._entries)
+        else:
+            row, (old_scope, _) = self._entries.popitem(last=False)
+            old_rows = self._scope_rows[old_scope]
+            old_rows.discard(row)
+            if not old_rows:
+                del self._scope_rows[old_scope]
+
+        self._embeddings[row] = vector
+        self._entries[row] = (scope, deepcopy(result))
+        self._scope_rows.setdefault(scope, set()).add(row)
+
+    def __len__(self) -> int:
+        return len(self._entries)
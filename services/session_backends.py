@@ -0,0 +1,204 @@
+"""
+Session Backends - Storage for research sessions.
+"""
+from collections import deque
+from functools import partial
+from typing import Dict, Any, List, Optional, Protocol
+
+# Session fields stored in their own column by InMemoryBackend
+_COLUMNS = (
+    "user_id",
+    "created_at",
+    "updated_at",
+    "status",
+    "initial_query",
+    "messages",
+    "context",
+    "results"
+)
+
+class SessionBackend(Protocol):
+    """Storage interface used by ResearchSessionService."""
+    
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Return the session, or None if it does not exist."""
+        ...
+    
+    def set(self, session_id: str, session: Dict[str, Any]):
+        """Create or replace a session."""
+        ...
+    
+    def delete(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Remove a session and its archive, returning the session if it existed."""
+        ...
+    
+    def append_archive(self, session_id: str, message: Dict[str, Any]):
+        """Archive a message evicted from a session's ring buffer."""
+        ...
+    
+    def get_archive(self, session_id: str) -> List[Dict[str, Any]]:
+        """Archived messages of a session, oldest first."""
+        ...
+    
+    def list_ids(
+        self,
+        user_id: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> List[str]:
+        """IDs of sessions matching the given user and/or status."""
+        ...
+
+class InMemoryBackend:
+    """
+    Process-local session storage.
+    
+    Sessions are stored column-wise: one dict per field, keyed by session
+    ID, so scans such as "all paused sessions" touch a single column.
+    get assembles a dict view on demand whose messages and context are the
+    stored objects. Archived messages are kept per session until the
+    session is deleted.
+    """
+    
+    def __init__(self):
+        self._columns: Dict[str, Dict[str, Any]] = {field: {} for field in _COLUMNS}
+        self._status = self._columns["status"]
+        self._user = self._columns["user_id"]
+        # Any other fields set through update_session
+        self._extra: Dict[str, Dict[str, Any]] = {}
+        self._archive: Dict[str, List[Dict[str, Any]]] = {}
+    
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        if session_id not in self._status:
+            return None
+        view = {"session_id": session_id}
+        for field, column in self._columns.items():
+            view[field] = column[session_id]
+        view.update(self._extra[session_id])
+        return view
+    
+    def set(self, session_id: str, session: Dict[str, Any]):
+        extra = {}
+        for field, value in session.items():
+            column = self._columns.get(field)
+            if column is not None:
+                column[session_id] = value
+            elif field != "session_id":
+                extra[field] = value
+        self._extra[session_id] = extra
+    
+    def delete(self, session_id: str) -> Optional[Dict[str, Any]]:
+        session = self.get(session_id)
+        if session is not None:
+            for column in self._columns.values():
+                column.pop(session_id, None)
+            self._extra.pop(session_id, None)
+        self._archive.pop(session_id, None)
+        return session
+    
+    def append_archive(self, session_id: str, message: Dict[str, Any]):
+        self._archive.setdefault(session_id, []).append(message)
+    
+    def get_archive(self, session_id: str) -> List[Dict[str, Any]]:
+        return list(self._archive.get(session_id, ()))
+    
+    def list_ids(
+        self,
+        user_id: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> List[str]:
+        # list() copies the column in one atomic step, so concurrent
+        # creates and deletes cannot break the scan
+        rows = list(self._status.items())
+        return [
+            sid for sid, s in rows
+            if (status is None or s == status)
+            and (user_id is None or self._user.get(sid) == user_id)
+        ]
+
+def _encode(obj: Any) -> Any:
+    """MessagePack fallback: message ring buffers as lists, anything else as str."""
+    return list(obj) if isinstance(obj, deque) else str(obj)
+
+class RedisBackend:
+    """
+    Redis session storage, shared across workers and replicas.
+    
+    Sessions are stored as MessagePack blobs under `prefix + session_id`,
+    and archived messages as a list of blobs under
+    `archive_prefix + session_id`. Each write resets both keys' TTL:
+    `completed_ttl_seconds` for completed sessions when set, otherwise
+    `ttl_seconds`. Requires the redis and msgpack packages.
+    """
+    
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        prefix: str = "researchpro:session:",
+        archive_prefix: str = "researchpro:archive:",
+        ttl_seconds: Optional[int] = None,
+        completed_ttl_seconds: Optional[int] = None
+    ):
+        import msgpack
+        import redis
+        
+        self._redis = redis.Redis.from_url(url)
+        self._prefix = prefix
+        self._archive_prefix = archive_prefix
+        self._ttl_seconds = ttl_seconds
+        self._completed_ttl_seconds = completed_ttl_seconds
+        self._pack = partial(msgpack.packb, use_bin_type=True, default=_encode)
+        self._unpack = partial(msgpack.unpackb, raw=False)
+    
+    def _key(self, session_id: str) -> str:
+        return self._prefix + session_id
+    
+    def _archive_key(self, session_id: str) -> str:
+        return self._archive_prefix + session_id
+    
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        blob = self._redis.get(self._key(session_id))
+        return self._unpack(blob) if blob is not None else None
+    
+    def set(self, session_id: str, session: Dict[str, Any]):
+        ttl = self._ttl_seconds
+        if self._completed_ttl_seconds is not None and session.get("status") == "completed":
+            ttl = self._completed_ttl_seconds
+        pipe = self._redis.pipeline()
+        pipe.set(self._key(session_id), self._pack(session), ex=ttl)
+        if ttl is not None:
+            pipe.expire(self._archive_key(session_id), ttl)
+        pipe.execute()
+    
+    def delete(self, session_id: str) -> Optional[Dict[str, Any]]:
+        pipe = self._redis.pipeline()
+        pipe.getdel(self._key(session_id))
+        pipe.delete(self._archive_key(session_id))
+        blob = pipe.execute()[0]
+        return self._unpack(blob) if blob is not None else None
+    
+    def append_archive(self, session_id: str, message: Dict[str, Any]):
+        # The session write that follows sets the archive's TTL
+        self._redis.rpush(self._archive_key(session_id), self._pack(message))
+    
+    def get_archive(self, session_id: str) -> List[Dict[str, Any]]:
+        return [self._unpack(blob) for blob in self._redis.lrange(self._archive_key(session_id), 0, -1)]
+    
+    def list_ids(
+        self,
+        user_id: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> List[str]:
+        # Loads every session; fine for admin use, not for hot paths
+        ids = []
+        keys = list(self._redis.scan_iter(match=self._prefix + "*", count=500))
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            for blob in self._redis.mget(batch):
+                if blob is None:
+                    continue
+                session = self._unpack(blob)
+                if (status is None or session.get("status") == status) and (
+                    user_id is None or session.get("user_id") == user_id
+                ):
+                    ids.append(session["session_id"])
+        return ids
@@ -1,10 +1,31 @@
 """
 Session Service - Manage research sessions and conversation threads.
 """
-from typing import Dict, Any, List, Optional
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional, Set, Tuple
 from datetime import datetime
+import heapq
+import sys
+import threading
+import time
 import uuid
 
+from services.session_backends import InMemoryBackend, SessionBackend
+
+_now = time.time
+
+# Number of lock stripes; must be a power of two
+_LOCK_STRIPES = 32
+
+# Session statuses; values set through the service are interned, so every
+# session shares one string object per status
+_STATUS = {s: sys.intern(s) for s in ("active", "paused", "completed", "failed")}
+
+def _iso(ts: float) -> str:
+    """ISO 8601 string for an epoch timestamp."""
+    return datetime.fromtimestamp(ts).isoformat()
+
 class ResearchSessionService:
     """
     Manages research sessions.
@@ -14,10 +35,86 @@ class ResearchSessionService:
     - Track research progress
     - Support pause/resume workflows
     - Session persistence (in-memory for demo, DB for production)
+    
+    Storage is delegated to a SessionBackend (InMemoryBackend by default).
+    With a remote backend such as RedisBackend, get_session reads through a
+    local LRU cache whose entries live for `read_cache_ttl_seconds` and are
+    invalidated on every write made through this service; treat sessions
+    returned from it as read-only. Updates always re-read the session from
+    the backend, so they never overwrite other replicas' writes with cached
+    data.
+    
+    Sessions expire after `idle_ttl_seconds` without updates, or
+    `completed_ttl_seconds` after completion. A daemon thread sweeps
+    expired sessions every `sweep_interval` seconds. Beyond `max_sessions`,
+    the least recently used session that is neither paused nor held by
+    `in_use` is evicted.
+    Expiry and eviction only apply to the in-memory backend: a shared
+    backend is written by other processes this one cannot see, so it must
+    expire sessions itself (e.g. RedisBackend's TTLs).
+    
+    A session's "messages" is a ring buffer of its last `max_messages`
+    messages; older messages are moved to the backend's archive for the
+    session and returned by get_messages together with the recent ones.
     """
     
-    def __init__(self):
-        self._sessions: Dict[str, Dict[str, Any]] = {}
+    def __init__(
+        self,
+        backend: Optional[SessionBackend] = None,
+        read_cache_size: int = 1024,
+        read_cache_ttl_seconds: float = 1.0,
+        idle_ttl_seconds: float = 24 * 60 * 60,
+        completed_ttl_seconds: float = 300,
+        sweep_interval: Optional[float] = 30,
+        max_sessions: int = 10_000,
+        max_messages: int = 200
+    ):
+        self._backend = backend if backend is not None else InMemoryBackend()
+        # Expiry and LRU state is per process, so it may only delete
+        # sessions that no other process can be using
+        self._tracks_expiry = isinstance(self._backend, InMemoryBackend)
+        # The in-memory backend is already local, so it needs no read cache
+        self._read_cache_size = read_cache_size if backend is not None else 0
+        self.read_cache_ttl_seconds = read_cache_ttl_seconds
+        # session_id -> (monotonic expiry, session), least recently used first
+        self._read_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._read_cache_lock = threading.Lock()
+        
+        # Striped per-session locks: operations on different sessions run in
+        # parallel, operations on one session serialize, and each
+        # read-modify-write of a session happens under its lock.
+        self._stripes = [threading.Lock() for _ in range(_LOCK_STRIPES)]
+        
+        self.max_messages = max_messages
+        
+        # session_id -> monotonic expiry time, least recently used first.
+        # Each session has one scheduled (time, session_id) heap entry, no
+        # later than its expiry: refreshed sessions are rescheduled when their
+        # entry surfaces, and a shortened expiry pushes a new entry, leaving
+        # the old one stale.
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.completed_ttl_seconds = completed_ttl_seconds
+        self.max_sessions = max_sessions
+        self._expiry: "OrderedDict[str, float]" = OrderedDict()
+        # Paused sessions await human approval and are never evicted for size
+        self._paused: Set[str] = set()
+        # session_id -> number of in_use holders; pinned sessions are never
+        # evicted for size
+        self._pins: Dict[str, int] = {}
+        self._expiry_heap: List[Tuple[float, str]] = []
+        # session_id -> time of its scheduled heap entry
+        self._scheduled: Dict[str, float] = {}
+        self._expiry_lock = threading.Lock()
+        self._stop_sweeper = threading.Event()
+        self._sweeper: Optional[threading.Thread] = None
+        if sweep_interval and self._tracks_expiry:
+            self._sweeper = threading.Thread(
+                target=self._sweep_loop,
+                args=(sweep_interval,),
+                name="session-sweeper",
+                daemon=True
+            )
+            self._sweeper.start()
     
     def create_session(
         self,
@@ -26,25 +123,176 @@ class ResearchSessionService:
     ) -> Dict[str, Any]:
         """Create a new research session."""
         session_id = str(uuid.uuid4())
+        now = _now()
         
+        # Timestamps are epoch floats; format with _iso only when needed
         session = {
             "session_id": session_id,
             "user_id": user_id,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-            "status": "active",  # active, paused, completed, failed
+            "created_at": now,
+            "updated_at": now,
+            "status": _STATUS["active"],  # active, paused, completed, failed
             "initial_query": initial_query,
-            "messages": [],
+            "messages": self._new_messages(),
             "context": {},
             "results": None
         }
         
-        self._sessions[session_id] = session
+        with self._lock_for(session_id):
+            self._store(session_id, session)
+        self._evict_lru()
+        return session
+    
+    def _new_messages(self, messages=()) -> deque:
+        return deque(messages, maxlen=self.max_messages)
+    
+    def _lock_for(self, session_id: str) -> threading.Lock:
+        """Lock stripe guarding a session."""
+        return self._stripes[hash(session_id) & (_LOCK_STRIPES - 1)]
+    
+    def _load(self, session_id: str, fresh: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Read a session, through the local cache unless `fresh`.
+        
+        Call with the session's lock held. Read-modify-write paths pass
+        fresh=True: the cache only sees this process's writes, so building
+        an update from it could discard another replica's changes.
+        """
+        if not self._read_cache_size or fresh:
+            return self._backend.get(session_id)
+        
+        now = time.monotonic()
+        with self._read_cache_lock:
+            entry = self._read_cache.get(session_id)
+            if entry is not None:
+                if entry[0] > now:
+                    self._read_cache.move_to_end(session_id)
+                    return entry[1]
+                del self._read_cache[session_id]
+        
+        session = self._backend.get(session_id)
+        if session is not None:
+            with self._read_cache_lock:
+                self._read_cache[session_id] = (now + self.read_cache_ttl_seconds, session)
+                if len(self._read_cache) > self._read_cache_size:
+                    self._read_cache.popitem(last=False)
         return session
     
+    def _store(self, session_id: str, session: Dict[str, Any]):
+        """Write a session through to the backend. Call with the session's lock held."""
+        self._backend.set(session_id, session)
+        self._invalidate(session_id)
+        self._touch(session_id, session["status"])
+    
+    def _touch(self, session_id: str, status: str):
+        """(Re)set a session's expiry and mark it most recently used."""
+        if not self._tracks_expiry:
+            return
+        ttl = self.completed_ttl_seconds if status == _STATUS["completed"] else self.idle_ttl_seconds
+        expiry = time.monotonic() + ttl
+        with self._expiry_lock:
+            scheduled = self._scheduled.get(session_id)
+            if scheduled is None or expiry < scheduled:
+                heapq.heappush(self._expiry_heap, (expiry, session_id))
+                self._scheduled[session_id] = expiry
+            self._expiry[session_id] = expiry
+            self._expiry.move_to_end(session_id)
+            if status == _STATUS["paused"]:
+                self._paused.add(session_id)
+            else:
+                self._paused.discard(session_id)
+    
+    def _evict_lru(self):
+        """Delete least recently used sessions beyond max_sessions."""
+        victims = []
+        with self._expiry_lock:
+            excess = len(self._expiry) - self.max_sessions
+            if excess <= 0:
+                return
+            for session_id in self._expiry:
+                if session_id not in self._paused and session_id not in self._pins:
+                    victims.append(session_id)
+                    if len(victims) == excess:
+                        break
+        
+        for session_id in victims:
+            self.delete_session(session_id)
+    
+    @contextmanager
+    def in_use(self, session_id: str) -> Iterator[None]:
+        """
+        Pin a session so LRU eviction skips it while the block runs.
+        
+        Use around work that reads a session and writes it back later, so
+        other sessions being created meanwhile cannot evict it.
+        """
+        with self._expiry_lock:
+            self._pins[session_id] = self._pins.get(session_id, 0) + 1
+        try:
+            yield
+        finally:
+            with self._expiry_lock:
+                if self._pins[session_id] == 1:
+                    del self._pins[session_id]
+                else:
+                    self._pins[session_id] -= 1
+    
+    def _sweep(self) -> int:
+        """Delete expired sessions; returns how many were removed."""
+        now = time.monotonic()
+        expired = []
+        with self._expiry_lock:
+            heap = self._expiry_heap
+            while heap and heap[0][0] <= now:
+                scheduled, session_id = heapq.heappop(heap)
+                if self._scheduled.get(session_id) != scheduled:
+                    continue  # Stale entry, or session already deleted
+                expiry = self._expiry[session_id]
+                if expiry > now:
+                    heapq.heappush(heap, (expiry, session_id))
+                    self._scheduled[session_id] = expiry
+                else:
+                    del self._expiry[session_id]
+                    del self._scheduled[session_id]
+                    self._paused.discard(session_id)
+                    expired.append(session_id)
+        
+        for session_id in expired:
+            self.delete_session(session_id)
+        return len(expired)
+    
+    def _sweep_loop(self, interval: float):
+        while not self._stop_sweeper.wait(interval):
+            self._sweep()
+    
+    def close(self):
+        """Stop the background expiry sweep."""
+        self._stop_sweeper.set()
+        if self._sweeper is not None:
+            self._sweeper.join()
+    
+    def _invalidate(self, session_id: str):
+        if self._read_cache_size:
+            with self._read_cache_lock:
+                self._read_cache.pop(session_id, None)
+    
     def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve a session by ID."""
-        return self._sessions.get(session_id)
+        with self._lock_for(session_id):
+            session = self._load(session_id)
+        if session is not None:
+            with self._expiry_lock:
+                if session_id in self._expiry:
+                    self._expiry.move_to_end(session_id)
+        return session
+    
+    def list_sessions(
+        self,
+        user_id: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> List[str]:
+        """IDs of sessions matching the given user and/or status."""
+        return self._backend.list_ids(user_id=user_id, status=status)
     
     def update_session(
         self,
@@ -52,14 +300,18 @@ class ResearchSessionService:
         **updates
     ) -> Dict[str, Any]:
         """Update session data."""
-        if session_id not in self._sessions:
-            raise ValueError(f"Session {session_id} not found")
-        
-        session = self._sessions[session_id]
-        session.update(updates)
-        session["updated_at"] = datetime.now().isoformat()
+        now = _now()
+        with self._lock_for(session_id):
+            session = self._load(session_id, fresh=True)
+            if session is None:
+                raise ValueError(f"Session {session_id} not found")
         
-        return session
+            status = updates.get("status")
+            if isinstance(status, str):
+                updates["status"] = sys.intern(status)
+            session = {**session, **updates, "updated_at": now}
+            self._store(session_id, session)
+            return session
     
     def add_message(
         self,
@@ -68,35 +320,68 @@ class ResearchSessionService:
         content: str
     ):
         """Add a message to the session."""
-        session = self.get_session(session_id)
-        if session:
-            session["messages"].append({
-                "role": role,
-                "content": content,
-                "timestamp": datetime.now().isoformat()
-            })
-            session["updated_at"] = datetime.now().isoformat()
+        now = _now()
+        message = {
+            "role": sys.intern(role),
+            "content": content,
+            "timestamp": now
+        }
+        with self._lock_for(session_id):
+            session = self._load(session_id, fresh=True)
+            if session is not None:
+                messages = session["messages"]
+                if not isinstance(messages, deque):
+                    # Remote backends hand back plain lists
+                    messages = session["messages"] = self._new_messages(messages)
+                if len(messages) == messages.maxlen:
+                    self._backend.append_archive(session_id, messages[0])
+                messages.append(message)
+                session["updated_at"] = now
+                self._store(session_id, session)
+    
+    def get_messages(self, session_id: str) -> List[Dict[str, Any]]:
+        """All messages of a session, oldest first, including archived ones."""
+        with self._lock_for(session_id):
+            session = self._load(session_id)
+            if session is None:
+                return []
+            return self._backend.get_archive(session_id) + list(session["messages"])
     
     def pause_session(self, session_id: str, reason: str):
         """Pause a session (for long-running operations)."""
         self.update_session(
             session_id,
-            status="paused",
+            status=_STATUS["paused"],
             pause_reason=reason
         )
     
     def resume_session(self, session_id: str):
         """Resume a paused session."""
-        self.update_session(session_id, status="active")
+        self.update_session(session_id, status=_STATUS["active"])
     
     def complete_session(self, session_id: str, results: Dict[str, Any]):
         """Mark session as completed with results."""
         self.update_session(
             session_id,
-            status="completed",
+            status=_STATUS["completed"],
             results=results,
-            completed_at=datetime.now().isoformat()
+            completed_at=_now()
         )
+    
+    def delete_session(self, session_id: str):
+        """Delete a session."""
+        with self._lock_for(session_id):
+            self._backend.delete(session_id)
+            self._invalidate(session_id)
+        with self._expiry_lock:
+            self._expiry.pop(session_id, None)
+            self._scheduled.pop(session_id, None)
+            self._paused.discard(session_id)
+    
+    def iso_updated_at(self, session_id: str) -> Optional[str]:
+        """Last update time of a session as an ISO 8601 string."""
+        session = self.get_session(session_id)
+        return _iso(session["updated_at"]) if session else None
 
 
 # ============================================================================
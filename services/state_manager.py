@@ -1,24 +1,66 @@
 """
 State Manager - Manage shared state between agents.
 """
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime
+import threading
+import time
 
 class ResearchStateManager:
-    """Manages shared state between agents."""
+    """
+    Manages shared state between agents.
+    
+    Thread safety: set_state, get_state and update_all are single dict
+    operations, atomic under the GIL, and take no lock. Read-modify-write
+    sequences must use compare_and_set, which is atomic with respect to
+    other compare_and_set calls.
+    """
     
     def __init__(self):
         self._state: Dict[str, Any] = {}
+        # Epoch time of each key's last write, kept beside the values so
+        # reads need no unwrapping
+        self._updated_at: Dict[str, float] = {}
+        self._cas_lock = threading.Lock()
     
     def set_state(self, key: str, value: Any):
         """Set a state value."""
-        self._state[key] = {"value": value, "updated_at": datetime.now().isoformat()}
+        self._state[key] = value
+        self._updated_at[key] = time.time()
+    
+    def update_all(self, mapping: Dict[str, Any]):
+        """Set several state values at once."""
+        now = time.time()
+        self._state.update(mapping)
+        self._updated_at.update(dict.fromkeys(mapping, now))
+    
+    def compare_and_set(self, key: str, expected: Any, new: Any) -> bool:
+        """
+        Set a state value only if it currently equals `expected`.
+        
+        Args:
+            key: State key
+            expected: Value the key must hold (None for an unset key)
+            new: Value to store
+            
+        Returns:
+            True if the value was replaced
+        """
+        with self._cas_lock:
+            if self._state.get(key) != expected:
+                return False
+            self.set_state(key, new)
+            return True
     
     def get_state(self, key: str, default: Any = None) -> Any:
         """Get a state value."""
-        entry = self._state.get(key)
-        return entry["value"] if entry else default
+        return self._state.get(key, default)
+    
+    def get_updated_at(self, key: str) -> Optional[str]:
+        """Last write time of a state value as an ISO 8601 string."""
+        updated_at = self._updated_at.get(key)
+        return datetime.fromtimestamp(updated_at).isoformat() if updated_at is not None else None
     
     def get_all_state(self) -> Dict[str, Any]:
         """Get all current state."""
-        return {k: v["value"] for k, v in self._state.items()}
+        return self._state.copy()
\ No newline at end of file
@@ -8,7 +8,17 @@ and validates its functionality.
 import os
 import asyncio
 from typing import Dict, Any
-import json
+
+try:
+    import orjson
+
+    def _dump_json(obj, f):
+        f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode())
+except ImportError:
+    import json
+
+    def _dump_json(obj, f):
+        json.dump(obj, f, indent=2)
 
 # For deployed agent testing
 try:
@@ -181,36 +191,28 @@ class DeployedAgentTester:
         print(f"\nProject: {self.project_id}")
         print(f"Location: {self.location}")
         
-        results = []
+        # The tests are independent round trips to the deployed agent, so
+        # run them concurrently; a failing test does not cancel the others
+        tests = [
+            ("Basic Research", self.test_basic_research()),
+            ("Multi-Source", self.test_multi_source_research()),
+            ("Memory", self.test_memory_persistence()),
+            ("Long-Running", self.test_long_running_operation())
+        ]
+        outcomes = await asyncio.gather(
+            *(test for _, test in tests),
+            return_exceptions=True
+        )
         
-        # Run tests
-        try:
-            result1 = await self.test_basic_research()
-            results.append(("Basic Research", result1["success"]))
-        except Exception as e:
-            print(f"\n❌ Test failed: {e}")
-            results.append(("Basic Research", False))
-        
-        try:
-            result2 = await self.test_multi_source_research()
-            results.append(("Multi-Source", result2["success"]))
-        except Exception as e:
-            print(f"\n❌ Test failed: {e}")
-            results.append(("Multi-Source", False))
-        
-        try:
-            result3 = await self.test_memory_persistence()
-            results.append(("Memory", result3["success"]))
-        except Exception as e:
-            print(f"\n❌ Test failed: {e}")
-            results.append(("Memory", False))
-        
-        try:
-            result4 = await self.test_long_running_operation()
-            results.append(("Long-Running", result4["success"]))
-        except Exception as e:
-            print(f"\n❌ Test failed: {e}")
-            results.append(("Long-Running", False))
+        results = []
+        for (name, _), outcome in zip(tests, outcomes):
+            if isinstance(outcome, Exception):
+                print(f"\n❌ Test failed: {outcome}")
+                results.append((name, False))
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                results.append((name, outcome.get("success", False)))
         
         # Print summary
         print("\n" + "="*70)
@@ -259,14 +261,14 @@ async def main():
     
     # Export results
     with open("test_results.json", "w") as f:
-        json.dump({
+        _dump_json({
             "project_id": project_id,
             "location": location,
             "tests": [
                 {"name": name, "passed": success}
                 for name, success in results
             ]
-        }, f, indent=2)
+        }, f)
     
     print("\nResults exported to test_results.json")
 
@@ -1,9 +1,21 @@
 """
 Academic Search - Custom tool for ResearchPro.
 """
-from typing import Dict, Any, List, Optional
-from datetime import datetime
-import re
+from collections import OrderedDict
+from copy import deepcopy
+from itertools import chain, zip_longest
+from typing import Dict, Any, List, Optional, Tuple
+import asyncio
+import logging
+import sys
+import time
+
+from tools.citation_tool import parse_author
+
+logger = logging.getLogger("researchpro")
+
+# Academic indexes change slowly, so results stay fresh for hours
+DEFAULT_CACHE_TTL_SECONDS = 6 * 60 * 60
 
 class AcademicSearchTool:
     """
@@ -19,10 +31,19 @@ class AcademicSearchTool:
     This is a simplified implementation for the capstone.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        cache_ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS,
+        cache_max_entries: int = 256
+    ):
         self.name = "academic_search"
         self.description = "Search academic databases for peer-reviewed research"
         
+        # Search key -> (expires_at, results), least recently used first
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.cache_max_entries = cache_max_entries
+        self._cache: "OrderedDict[Tuple[Any, ...], Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        
     async def search(
         self,
         query: str,
@@ -45,24 +66,99 @@ class AcademicSearchTool:
         if databases is None:
             databases = ["arxiv", "scholar"]
         
+        # Keyed on the exact query: results echo the query text back in
+        # titles and abstracts, so queries differing only in case or
+        # whitespace must not share an entry
+        key = (query, tuple(sorted(databases)), max_results, year_from)
+        entry = self._cache.get(key)
+        if entry is not None:
+            expires_at, cached = entry
+            if expires_at > time.monotonic():
+                self._cache.move_to_end(key)
+                # Copies keep callers from mutating the cached results
+                return deepcopy(cached)
+            del self._cache[key]
+        
+        # Databases are queried concurrently; one failing database only
+        # loses its own results
+        per_db = await asyncio.gather(
+            *(self._search_one(db, query, max_results, year_from) for db in databases),
+            return_exceptions=True
+        )
+        
+        ranked = []
+        complete = True
+        for db, papers in zip(databases, per_db):
+            if isinstance(papers, Exception):
+                logger.warning(f"Academic search failed for {db}: {papers}")
+                complete = False
+            elif isinstance(papers, BaseException):
+                raise papers
+            else:
+                ranked.append(papers)
+        
+        # Interleave databases by rank so truncation keeps each one's top hits
+        merged = (
+            paper
+            for paper in chain.from_iterable(zip_longest(*ranked))
+            if paper is not None
+        )
+        results = list(merged)[:max_results]
+        
+        # Partial results are not cached, so the next call retries the
+        # failed databases
+        if complete:
+            self._cache[key] = (time.monotonic() + self.cache_ttl_seconds, deepcopy(results))
+            if len(self._cache) > self.cache_max_entries:
+                self._cache.popitem(last=False)
+        return results
+    
+    async def _search_one(
+        self,
+        database: str,
+        query: str,
+        max_results: int,
+        year_from: Optional[int]
+    ) -> List[Dict[str, Any]]:
+        """
+        Search a single academic database.
+        
+        Args:
+            database: Database to search (arxiv, pubmed, scholar)
+            query: Search query
+            max_results: Maximum number of results
+            year_from: Only return papers from this year onwards
+            
+        Returns:
+            Papers from this database, best match first
+        """
+        # Every paper repeats its database name; share one string object
+        database = sys.intern(database)
+        
         # Simulate academic search results
-        # In production, would actually query MCP servers
+        # In production, would actually query the database's MCP server
         results = []
         
         for i in range(min(max_results, 5)):
+            authors = ["Dr. Smith", "Dr. Johnson"]
             results.append({
                 "title": f"Academic Paper on {query} - Study {i+1}",
-                "authors": ["Dr. Smith", "Dr. Johnson"],
+                "authors": authors,
+                # Parsed once here so citation formatting can skip it
+                "authors_parsed": [parse_author(a) for a in authors],
                 "year": 2024,
                 "journal": "Nature" if i % 2 == 0 else "Science",
-                "doi": f"10.1000/example.{i}",
+                "doi": f"10.1000/{database}.{i}",
                 "abstract": f"This paper explores {query} using novel methodology...",
                 "citations": 150 - i * 10,
-                "database": databases[i % len(databases)],
-                "url": f"https://arxiv.org/abs/2024.{i:05d}",
+                "database": database,
+                "url": f"https://{database}.example.org/abs/2024.{i:05d}",
                 "credibility_score": 0.95 - i * 0.05
             })
         
+        if year_from is not None:
+            results = [paper for paper in results if paper["year"] >= year_from]
+        
         return results
     
     def as_mcp_tool(self) -> Dict[str, Any]:
@@ -1,9 +1,25 @@
 """
 Citation Tool - Custom tool for ResearchPro.
 """
-from typing import Dict, Any, List, Optional
-from datetime import datetime
-import re
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
+
+# Source fields read by the formatters, in cache-key order
+_CITATION_FIELDS = ("title", "authors", "authors_parsed", "year", "journal", "doi", "url")
+# Marks a field absent from the source, so formatter defaults still apply
+_MISSING = object()
+
+def parse_author(author: str) -> Tuple[str, str]:
+    """
+    Split an author name into (last name, first initial).
+    
+    Honorifics ("Dr. ") are dropped. Names with a single part are returned
+    unchanged with an empty initial.
+    """
+    parts = author.replace("Dr. ", "").split()
+    if len(parts) >= 2:
+        return parts[-1], parts[0][0]
+    return author, ""
 
 class CitationFormatterTool:
     """
@@ -32,7 +48,28 @@ class CitationFormatterTool:
             Formatted citation string
         """
         style = style.upper()
-        
+        key = self._source_key(source)
+        # The memo formats with a shared plain instance, so subclasses that
+        # override formatting bypass it
+        if key is None or type(self) is not CitationFormatterTool:
+            return self._format_uncached(source, style)
+        return _format_cached(key, style)
+    
+    @staticmethod
+    def _source_key(source: Dict[str, Any]) -> Optional[Tuple[Any, ...]]:
+        """Hashable key of the fields a citation depends on, or None if unhashable."""
+        key = tuple(
+            tuple(value) if isinstance(value, list) else value
+            for value in (source.get(field, _MISSING) for field in _CITATION_FIELDS)
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+    
+    def _format_uncached(self, source: Dict[str, Any], style: str) -> str:
+        """Format a source in an upper-cased style."""
         if style == "APA":
             return self._format_apa(source)
         elif style == "MLA":
@@ -50,8 +87,14 @@ class CitationFormatterTool:
         journal = source.get("journal", "")
         doi = source.get("doi", "")
         
-        # Format authors (Last, F. M.)
-        author_str = ", ".join([self._format_author_apa(a) for a in authors])
+        # Format authors (Last, F. M.), using names parsed at ingest if present
+        parsed = source.get("authors_parsed")
+        if parsed is None:
+            parsed = [parse_author(a) for a in authors]
+        author_str = ", ".join([
+            f"{last}, {initial}." if initial else last
+            for last, initial in parsed
+        ])
         
         citation = f"{author_str} ({year}). {title}."
         
@@ -65,13 +108,6 @@ class CitationFormatterTool:
         
         return citation
     
-    def _format_author_apa(self, author: str) -> str:
-        """Format author name in APA style."""
-        parts = author.replace("Dr. ", "").split()
-        if len(parts) >= 2:
-            return f"{parts[-1]}, {parts[0][0]}."
-        return author
-    
     def _format_mla(self, source: Dict[str, Any]) -> str:
         """Format in MLA style."""
         authors = source.get("authors", ["Unknown"])
@@ -94,6 +130,21 @@ class CitationFormatterTool:
         return self._format_apa(source)  # Use APA as baseline
 
 
+# Formatting depends only on the source and style, so one instance serves
+# the module-level memo without keeping callers' instances alive
+_formatter = CitationFormatterTool()
+
+@lru_cache(maxsize=2048)
+def _format_cached(key: Tuple[Any, ...], style: str) -> str:
+    """Format the source described by a _source_key key; memoized."""
+    source = {
+        field: value
+        for field, value in zip(_CITATION_FIELDS, key)
+        if value is not _MISSING
+    }
+    return _formatter._format_uncached(source, style)
+
+
 # ============================================================================
 # QUALITY SCORER TOOL
 # ============================================================================
\ No newline at end of file